@@ -1,7 +1,11 @@
+from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from typing import List
 
+# Relative cache paths are resolved against this directory, not the working directory
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -17,6 +21,86 @@ class Settings(BaseSettings):
     CACHE_SIZE: int = 1000
     MAX_STORIES_PER_SEARCH: int = 1000
     EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    EMBEDDING_STORE_DIR: str = "cache/embeddings"  # Empty keeps per-text embeddings in memory only
+    EMBEDDING_BACKEND: str = "torch"  # torch or onnx (CPU, no torch import)
+    EMBEDDING_ONNX_DIR: str = "models/all-MiniLM-L6-v2-onnx"  # Relative to the backend directory
+    EMBEDDING_ONNX_QUANTIZED: bool = True  # Use the dynamically quantized int8 model
+    EMBEDDING_ONNX_THREADS: int = 0  # 0 lets ONNX Runtime decide
+    EMBEDDING_CHUNK_TOKENS: int = 0  # Tokens per content chunk (0 fills the model's window)
+    EMBEDDING_CHUNK_OVERLAP: int = 32  # Tokens shared by consecutive content chunks
+    EMBEDDING_MAX_CHUNKS_PER_STORY: int = 8
+    EMBEDDING_TOKEN_METRICS: bool = False  # Tokenize batches without known token counts (titles) for padding metrics
+
+    # Clustering
+    CLUSTER_REDUCTION: str = "umap"  # umap, pca_umap (PCA pre-reduction) or pca (fast preview)
+    CLUSTER_PCA_COMPONENTS: int = 50  # PCA dimensions for pca_umap layouts and pca cluster space
+    CLUSTER_SPACE: str = "2d"  # KMeans on the 2d layout, or spherical k-means on embedding / pca
+    CLUSTER_AUTO_K: str = "table"  # table (by sample count) or sweep (parallel silhouette sweep)
+    CLUSTER_K_MIN: int = 2
+    CLUSTER_K_MAX: int = 15
+    CLUSTER_AUTO_K_SAMPLE: int = 1000  # Points fitted and scored per k
+    CLUSTER_AUTO_K_BUDGET_MS: int = 1500  # No new k is tried after this long
+    CLUSTER_AUTO_K_WORKERS: int = 4
+    CLUSTER_TRUSTWORTHINESS: bool = True  # Score how well the 2D layout keeps neighbourhoods
+    CLUSTER_TRUSTWORTHINESS_SAMPLE: int = 1000  # Points scored (the metric is quadratic)
+    CLUSTER_INCREMENTAL: bool = True  # Place new stories of a reclustered search into the fitted clusters
+    CLUSTER_REFIT_NEW_FRACTION: float = 0.25  # Refit once this share of the fitted stories was added incrementally
+    CLUSTER_DRIFT_THRESHOLD: float = 0.25  # Refit when this share of new stories falls outside their cluster's radius
+    CLUSTER_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # Cluster results and fitted models, LRU-evicted beyond this
+    # Numba threading layers UMAP tries in order. TBB first started off the main thread (the
+    # background warmup) hangs the process on exit; omp and workqueue don't
+    NUMBA_THREADING_LAYER_PRIORITY: str = "omp workqueue tbb"
+
+    # Startup (runs in the background; /ready reports when it has finished)
+    PRELOAD_MODELS: bool = True  # Import ML libraries and load the embedding model at startup
+    WARMUP_MODELS: bool = True  # Also run the model, UMAP and KMeans once on dummy data
+
+    # Concept Graph
+    CONCEPT_EXTRACTION_CONCURRENCY: int = 8  # Concurrent LLM calls extracting article concepts
+    CONCEPT_EXTRACTION_BATCH_SIZE: int = 10  # Articles per extraction prompt (1 makes one call per article)
+    CONCEPT_EXTRACTION_BATCH_TOKENS: int = 6000  # Approximate token budget for the articles of one prompt
+    CONCEPT_STORE_ENABLED: bool = True  # Persist extracted concepts per article (shared across searches)
+    CONCEPT_STORE_PATH: str = "cache/concepts.sqlite3"
+    CONCEPT_STORE_MAX_ENTRIES: int = 100000
+    CONCEPT_DEDUP_ENABLED: bool = True  # Merge near-duplicate Layer 1 concepts by embedding similarity
+    CONCEPT_DEDUP_THRESHOLD: float = 0.85  # Cosine similarity at which two concept labels merge
+    CONCEPT_LAYER_MODE: str = "embedding"  # llm (aggregate + map calls per layer) or embedding (clustering + one naming call)
+
+    # HTTP Client Pool (shared across Algolia queries and article fetches)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
+
+    # Algolia Pagination
+    ALGOLIA_HITS_PER_PAGE: int = 100
+    ALGOLIA_PAGINATION_LIMIT: int = 1000  # Algolia only serves this many hits per query
+    ALGOLIA_PAGE_CONCURRENCY: int = 5
+
+    # Article Content Fetching
+    CONTENT_FETCH_CONCURRENCY: int = 50
+    CONTENT_FETCH_PER_HOST: int = 4
+    CONTENT_FETCH_TIMEOUT: float = 10.0  # Per-URL timeout in seconds
+    CONTENT_FETCH_DEADLINE: float = 30.0  # Budget in seconds for all URLs of a search
+    CONTENT_MAX_BYTES: int = 512 * 1024  # Stop downloading a page after this many bytes
+
+    # HTML Extraction
+    HTML_PARSER: str = "auto"  # auto, selectolax, lxml or html.parser
+    EXTRACTION_WORKERS: int = 0  # Worker processes (opt-in); 0 runs extraction in the thread pool
+
+    # Article Content Cache (disk-backed, keyed by normalized URL)
+    CONTENT_CACHE_ENABLED: bool = True
+    CONTENT_CACHE_PATH: str = "cache/content_cache.sqlite3"
+    CONTENT_CACHE_TTL_SECONDS: int = 6 * 3600  # Revalidate entries older than this
+    CONTENT_CACHE_MAX_AGE_SECONDS: int = 7 * 24 * 3600  # Evict entries older than this
+    CONTENT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Search Cache (in-memory, per search_id)
+    SEARCH_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    SEARCH_CACHE_TTL_SECONDS: int = 24 * 3600
+    CACHE_SWEEP_INTERVAL_SECONDS: int = 300
+    SEARCH_REUSE_SECONDS: int = 600  # Identical searches within this window reuse cached results
 
     # CORS Configuration
     CORS_ORIGINS: List[str] = [
@@ -32,6 +116,18 @@ class Settings(BaseSettings):
         extra="ignore"  # Ignore extra fields in .env file (like old Twitter API keys)
     )
 
+    def resolve_path(self, path: str) -> str:
+        """
+        Resolve a path setting against the backend directory.
+
+        Args:
+            path: Absolute path, or path relative to the backend directory
+
+        Returns:
+            Absolute path string
+        """
+        return str(BACKEND_DIR / path)
+
 
 # Global settings instance
 settings = Settings()
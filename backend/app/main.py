@@ -1,9 +1,22 @@
+import time
+
+_import_start = time.perf_counter()
+
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.models import HealthResponse
+from app.models import HealthResponse, ReadinessResponse
 from app.routers import hackernews, analysis
+from app.services.hackernews_service import hackernews_service
+from app.services.embedding_service import embedding_service
+from app.services.clustering_service import clustering_service
+from app.services.concept_graph_service import concept_graph_service
+from app.services.startup_service import startup_service
+
+# Heavy ML libraries are imported by the startup phases, not here
+_import_seconds = time.perf_counter() - _import_start
 
 
 @asynccontextmanager
@@ -13,13 +26,44 @@ async def lifespan(app: FastAPI):
     print("=" * 50)
     print("Hacker News Topic Analysis API Starting...")
     print("=" * 50)
-    print("Loading sentence-transformers model...")
-    # Models are loaded lazily when first used
-    print("API is ready!")
+    startup_service.record("app_import", _import_seconds)
+    print("Opening shared HTTP client pool...")
+    start = time.perf_counter()
+    await hackernews_service.start()
+    startup_service.record("http_client", time.perf_counter() - start)
+    # Drop embeddings and clusters together with the search they belong to
+    hackernews_service.cache.add_eviction_listener(embedding_service.clear_embeddings)
+    hackernews_service.cache.add_eviction_listener(clustering_service.clear_cluster_results)
+    cache_sweeper = asyncio.create_task(
+        hackernews_service.run_cache_sweeper(settings.CACHE_SWEEP_INTERVAL_SECONDS)
+    )
+    embedding_service.worker.start()
+
+    # Load and warm up models in the background so /health answers immediately;
+    # /ready reports when this has finished. Without preloading, models load on first use.
+    phases = []
+    if settings.PRELOAD_MODELS:
+        phases += [
+            ("import_embedding_backend", embedding_service.import_backend),
+            ("load_embedding_model", lambda: embedding_service.model),
+            ("import_clustering", clustering_service.import_backend)
+        ]
+        if settings.WARMUP_MODELS:
+            phases += [
+                ("warmup_embedding", embedding_service.warmup),
+                ("warmup_clustering", clustering_service.warmup)
+            ]
+    print(f"Running {len(phases)} startup phases in the background...")
+    startup_task = asyncio.create_task(startup_service.run(phases))
     print("=" * 50)
     yield
     # Shutdown
     print("Shutting down Hacker News Topic Analysis API...")
+    startup_task.cancel()
+    cache_sweeper.cancel()
+    embedding_service.worker.stop()
+    await hackernews_service.close()
+    concept_graph_service.close()
 
 
 # Create FastAPI application
@@ -46,13 +90,21 @@ app.include_router(analysis.router, prefix="/api/v1")
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check endpoint (does not wait for models)."""
     return HealthResponse(
         status="ok",
         message="Hacker News Analysis API is running"
     )
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response):
+    """Readiness check endpoint: 503 until models are loaded and warmed up."""
+    if not startup_service.is_ready:
+        response.status_code = 503
+    return ReadinessResponse(**startup_service.status())
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
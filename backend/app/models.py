@@ -43,11 +43,13 @@ class SearchResponse(BaseModel):
     stories: List[Story]
     stats: StoryStats
     search_id: str
+    fetch_stats: Optional[Dict[str, Any]] = Field(None, description="Algolia request count and elapsed milliseconds")
 
 
 class EmbedRequest(BaseModel):
     """Request model for generating embeddings."""
     search_id: str = Field(..., description="Search ID from previous search")
+    mode: str = Field(default="title", description="Embed story titles ('title') or chunked article content ('content')")
 
 
 class EmbedResponse(BaseModel):
@@ -57,11 +59,30 @@ class EmbedResponse(BaseModel):
     message: str
 
 
+class EmbeddingStatsResponse(BaseModel):
+    """Encoding throughput and padding statistics of the embedding service."""
+    backend: str = Field(..., description="Inference backend (torch or onnx)")
+    model: str = Field(..., description="Embedding model name")
+    batches: int = Field(..., description="Micro-batches run through the model")
+    texts: int = Field(..., description="Texts encoded by the model")
+    tokens: int = Field(..., description="Real tokens encoded in measured batches, including special tokens")
+    padded_tokens: int = Field(..., description="Tokens processed in measured batches after padding each to its longest text")
+    padding_overhead: float = Field(..., description="Fraction of processed tokens that were padding")
+    measured_batches: int = Field(..., description="Micro-batches with known token counts (all when EMBEDDING_TOKEN_METRICS is on)")
+    tokens_per_second: float = Field(..., description="Real tokens encoded per second of model time of the measured batches")
+    chunking: Dict[str, int] = Field(..., description="Stories, chunked stories and chunks from content mode")
+    worker: Dict[str, Any] = Field(..., description="Embedding worker micro-batching statistics")
+    store: Dict[str, int] = Field(..., description="Per-text embedding store statistics")
+
+
 class ClusterRequest(BaseModel):
     """Request model for clustering analysis."""
     search_id: str = Field(..., description="Search ID to cluster")
     algorithm: str = Field(default="kmeans", description="Clustering algorithm (only kmeans is supported)")
     n_clusters: Optional[int] = Field(default=None, description="Number of clusters (auto-determined if not provided)")
+    reduction: Optional[str] = Field(default=None, description="2D reduction: umap, pca_umap or pca (server default if not provided)")
+    cluster_space: Optional[str] = Field(default=None, description="Space to cluster in: 2d, embedding or pca (server default if not provided)")
+    auto_k: Optional[str] = Field(default=None, description="Cluster count selection without n_clusters: table or sweep (server default if not provided)")
 
 
 class ClusterData(BaseModel):
@@ -81,6 +102,14 @@ class ClusterResponse(BaseModel):
     success: bool
     visualization_data: Optional[ClusterData] = None
     message: str
+    reduction_stats: Optional[Dict[str, Any]] = Field(None, description="Reduction method, latency and trustworthiness")
+    clustering_stats: Optional[Dict[str, Any]] = Field(None, description="Cluster space, cluster count, latency, auto-k score curve and incremental update details")
+    search_id: Optional[str] = Field(None, description="Search ID of the clustered stories when it differs from the request's (refresh)")
+
+
+class RefreshRequest(BaseModel):
+    """Request model for refreshing a clustered search."""
+    search_id: str = Field(..., description="Search ID to re-fetch, re-embed and recluster")
 
 
 class SummaryRequest(BaseModel):
@@ -124,6 +153,8 @@ class ClusterGraphData(BaseModel):
 class ClusterGraphRequest(BaseModel):
     """Request model for cluster graph."""
     search_id: str = Field(..., description="Search ID with clustered results")
+    top_k: Optional[int] = Field(default=None, ge=1, description="Keep only each cluster's top_k most similar neighbours")
+    min_similarity: Optional[float] = Field(default=None, ge=0, le=1, description="Drop edges below this similarity")
 
 
 class ClusterGraphResponse(BaseModel):
@@ -161,9 +192,29 @@ class ConceptGraphResponse(BaseModel):
     message: str = Field(..., description="Status message")
 
 
+class CacheStatsResponse(BaseModel):
+    """Statistics for an in-memory cache."""
+    name: str = Field(..., description="Cache name")
+    entries: int = Field(..., description="Number of cached entries")
+    bytes: int = Field(..., description="Approximate memory used by entries")
+    max_bytes: int = Field(..., description="Byte budget before LRU eviction")
+    hits: int = Field(..., description="Number of cache hits")
+    misses: int = Field(..., description="Number of cache misses")
+    evictions: int = Field(..., description="Entries evicted to stay under the byte budget")
+    expirations: int = Field(..., description="Entries removed after their TTL")
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
     message: str
 
 
+class ReadinessResponse(BaseModel):
+    """Readiness check response."""
+    status: str = Field(..., description="Startup state: pending, starting, ready or failed")
+    ready: bool = Field(..., description="Whether models are loaded and warmed up")
+    phases: Dict[str, float] = Field(..., description="Elapsed milliseconds of each completed startup phase")
+    error: Optional[str] = Field(None, description="Failed phase and error message")
+
+
@@ -1,7 +1,8 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
 from app.models import (
-    EmbedRequest, EmbedResponse,
-    ClusterRequest, ClusterResponse,
+    EmbedRequest, EmbedResponse, EmbeddingStatsResponse,
+    ClusterRequest, ClusterResponse, RefreshRequest, CacheStatsResponse,
     SummaryRequest, SummaryResponse,
     ClusterGraphRequest, ClusterGraphResponse,
     ConceptGraphRequest, ConceptGraphResponse, ConceptGraphNode
@@ -33,28 +34,41 @@ async def generate_embeddings(request: EmbedRequest):
         if not stories:
             raise HTTPException(status_code=404, detail="Search ID not found or no stories available")
 
-        # Generate embeddings
-        embeddings = embedding_service.generate_embeddings(stories, request.search_id)
+        # Generate embeddings on the embedding worker (keeps the event loop responsive)
+        embeddings = await embedding_service.generate_embeddings_async(stories, request.search_id, request.mode)
 
         return EmbedResponse(
             embedding_complete=True,
             story_count=len(stories),
-            message=f"Successfully generated embeddings for {len(stories)} stories"
+            message=f"Successfully generated {request.mode} embeddings for {len(stories)} stories"
         )
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating embeddings: {str(e)}")
 
 
+@router.get("/embed/stats", response_model=EmbeddingStatsResponse)
+async def get_embedding_stats():
+    """
+    Get encoding throughput, padding overhead and chunking statistics.
+
+    Returns:
+        EmbeddingStatsResponse with token, padding and micro-batch counters
+    """
+    return EmbeddingStatsResponse(**embedding_service.get_stats())
+
+
 @router.post("/cluster", response_model=ClusterResponse)
 async def cluster_stories(request: ClusterRequest):
     """
     Perform UMAP dimensionality reduction and clustering on embedded stories.
 
     Args:
-        request: ClusterRequest with search_id, algorithm, and optional n_clusters
+        request: ClusterRequest with search_id, algorithm, optional n_clusters, reduction, cluster_space and auto_k
 
     Returns:
         ClusterResponse with visualization data
@@ -84,21 +98,101 @@ async def cluster_stories(request: ClusterRequest):
             embeddings=embeddings,
             stories=stories,
             algorithm=request.algorithm,
-            n_clusters=request.n_clusters
+            n_clusters=request.n_clusters,
+            reduction=request.reduction,
+            cluster_space=request.cluster_space,
+            auto_k=request.auto_k
         )
 
+        cluster_results = clustering_service.get_cluster_results(request.search_id)
         return ClusterResponse(
             success=True,
             visualization_data=cluster_data,
-            message=f"Successfully clustered {len(stories)} stories"
+            message=f"Successfully clustered {len(stories)} stories",
+            reduction_stats=cluster_results.get('reduction_stats'),
+            clustering_stats=cluster_results.get('clustering_stats')
         )
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error clustering stories: {str(e)}")
 
 
+@router.get("/cluster/stats", response_model=CacheStatsResponse)
+async def get_cluster_cache_stats():
+    """
+    Get memory footprint and hit/miss/eviction counters of the cluster cache.
+
+    Returns:
+        CacheStatsResponse with entry count and byte usage
+    """
+    return CacheStatsResponse(**clustering_service.cache_stats())
+
+
+@router.post("/refresh", response_model=ClusterResponse)
+async def refresh_clusters(request: RefreshRequest):
+    """
+    Re-fetch a clustered search and cluster the result under a new search ID.
+
+    Stories already embedded are served from the embedding store, and new stories
+    are placed into the existing clusters without refitting unless too many are
+    new or they drift away from the cluster centroids. The old search keeps its
+    clusters for anyone still viewing it.
+
+    Args:
+        request: RefreshRequest with search_id
+
+    Returns:
+        ClusterResponse with visualization data and the new search_id
+    """
+    try:
+        params = clustering_service.get_cluster_params(request.search_id)
+        if params is None:
+            raise HTTPException(status_code=404, detail="No clusters found for this search. Call /cluster first.")
+        mode = embedding_service.get_embedding_mode(request.search_id) or 'title'
+
+        result = await hackernews_service.refresh_search(request.search_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Search ID not found")
+        stories, _, search_id = result
+
+        if len(stories) < 2:
+            return ClusterResponse(
+                success=False,
+                visualization_data=None,
+                message=f"Not enough stories for clustering (found {len(stories)}, need at least 2)"
+            )
+
+        embeddings = await embedding_service.generate_embeddings_async(stories, search_id, mode)
+        cluster_data = clustering_service.analyze_and_cluster(
+            search_id=search_id,
+            embeddings=embeddings,
+            stories=stories,
+            base_search_id=request.search_id,
+            **params
+        )
+
+        cluster_results = clustering_service.get_cluster_results(search_id)
+        return ClusterResponse(
+            success=True,
+            visualization_data=cluster_data,
+            message=f"Successfully refreshed {len(stories)} stories",
+            reduction_stats=cluster_results.get('reduction_stats'),
+            clustering_stats=cluster_results.get('clustering_stats'),
+            search_id=search_id
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error refreshing clusters: {str(e)}")
+
+
 @router.post("/summarize", response_model=SummaryResponse)
 async def summarize_cluster(request: SummaryRequest):
     """
@@ -149,7 +243,7 @@ async def generate_cluster_graph(request: ClusterGraphRequest):
     Generate a cluster similarity graph for knowledge graph visualization.
 
     Args:
-        request: ClusterGraphRequest with search_id
+        request: ClusterGraphRequest with search_id and optional top_k / min_similarity edge filters
 
     Returns:
         ClusterGraphResponse with node and edge data for graph visualization
@@ -165,7 +259,11 @@ async def generate_cluster_graph(request: ClusterGraphRequest):
             )
 
         # Calculate cluster graph
-        graph_data_dict = clustering_service.calculate_cluster_graph(request.search_id)
+        graph_data_dict = clustering_service.calculate_cluster_graph(
+            request.search_id,
+            top_k=request.top_k,
+            min_similarity=request.min_similarity
+        )
 
         # Build response
         from app.models import ClusterGraphData, ClusterGraphNode, ClusterGraphEdge
@@ -237,8 +335,9 @@ async def generate_concept_graph(request: ConceptGraphRequest):
         
         print(f"Generating concept graph for cluster {request.cluster_id} with {len(top_stories)} stories (out of {len(cluster_stories)} total)")
         
-        # Build concept tree
-        result = concept_graph_service.build_concept_tree(
+        # Build concept tree on a worker thread (the LLM calls block)
+        result = await asyncio.to_thread(
+            concept_graph_service.build_concept_tree,
             stories=top_stories,
             search_id=request.search_id,
             cluster_id=request.cluster_id
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from app.models import SearchRequest, SearchResponse, SearchWithContentRequest, StoryStats
+from app.models import SearchRequest, SearchResponse, SearchWithContentRequest, StoryStats, CacheStatsResponse
 from app.services.hackernews_service import hackernews_service
 
 router = APIRouter(prefix="/hackernews", tags=["hackernews"])
@@ -27,7 +27,8 @@ async def search_stories(request: SearchRequest):
         return SearchResponse(
             stories=stories,
             stats=stats,
-            search_id=search_id
+            search_id=search_id,
+            fetch_stats=hackernews_service.get_fetch_stats(search_id)
         )
 
     except Exception as e:
@@ -56,7 +57,8 @@ async def search_stories_with_content(request: SearchWithContentRequest):
         return SearchResponse(
             stories=stories,
             stats=stats,
-            search_id=search_id
+            search_id=search_id,
+            fetch_stats=hackernews_service.get_fetch_stats(search_id)
         )
 
     except Exception as e:
@@ -86,3 +88,14 @@ async def get_stats(search_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving stats: {str(e)}")
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def get_cache_stats():
+    """
+    Get size and hit/miss/eviction counters of the search cache.
+
+    Returns:
+        CacheStatsResponse object
+    """
+    return CacheStatsResponse(**hackernews_service.cache.stats())
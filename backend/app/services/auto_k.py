@@ -0,0 +1,184 @@
+"""
+Automatic K Selection
+
+Sweeps a range of cluster counts on a subsample and picks the k with the
+best silhouette score. The range is split into contiguous chains that run
+in parallel threads (numpy releases the GIL in the matrix products); within
+a chain each k is warm-started from the k-1 solution plus one new centroid
+at the worst-served point. A latency budget stops the sweep early.
+
+Silhouette scores are computed for all points at once from one pairwise
+distance matrix: a single (n x n) @ (n x k) product gives every point's
+mean distance to every cluster.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.spherical_kmeans import spherical_kmeans
+
+METRICS = ('cosine', 'euclidean')
+
+
+def pairwise_distances(x: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Compute the full pairwise distance matrix.
+
+    Args:
+        x: Vectors (n_samples, n_features); unit-norm for the cosine metric
+        metric: 'cosine' or 'euclidean'
+
+    Returns:
+        Distance matrix (n_samples, n_samples)
+    """
+    if metric == 'cosine':
+        return np.clip(1.0 - x @ x.T, 0.0, None)
+    squared = np.sum(x * x, axis=1)
+    return np.sqrt(np.clip(squared[:, None] + squared[None, :] - 2.0 * (x @ x.T), 0.0, None))
+
+
+def silhouette_score_vectorized(distances: np.ndarray, labels: np.ndarray) -> float:
+    """
+    Mean silhouette coefficient from a precomputed distance matrix.
+
+    Args:
+        distances: Pairwise distances (n_samples, n_samples)
+        labels: Cluster label of each sample (contiguous from 0)
+
+    Returns:
+        Mean silhouette in [-1, 1] (0 for fewer than 2 clusters)
+    """
+    n_samples = len(labels)
+    n_clusters = int(labels.max()) + 1
+    if n_clusters < 2:
+        return 0.0
+
+    rows = np.arange(n_samples)
+    onehot = np.zeros((n_samples, n_clusters), dtype=distances.dtype)
+    onehot[rows, labels] = 1
+    counts = onehot.sum(axis=0)
+
+    # sums[i, c] = total distance from point i to the members of cluster c
+    sums = distances @ onehot
+    own_counts = counts[labels]
+    a = sums[rows, labels] / np.maximum(own_counts - 1, 1)
+
+    mean_other = sums / np.maximum(counts, 1)
+    mean_other[rows, labels] = np.inf
+    mean_other[:, counts == 0] = np.inf
+    b = mean_other.min(axis=1)
+
+    scores = (b - a) / np.maximum(np.maximum(a, b), 1e-12)
+    scores[own_counts <= 1] = 0.0  # Silhouette of a singleton is defined as 0
+    return float(scores.mean())
+
+
+def _fit(
+    x: np.ndarray,
+    k: int,
+    init: Optional[np.ndarray],
+    metric: str,
+    random_state: int
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Fit one k: spherical k-means for cosine, sklearn KMeans for euclidean."""
+    if metric == 'cosine':
+        return spherical_kmeans(x, k, n_init=1 if init is not None else 2, init=init, random_state=random_state)
+
+    from sklearn.cluster import KMeans
+
+    model = KMeans(
+        n_clusters=k,
+        init=init if init is not None else 'k-means++',
+        n_init=1 if init is not None else 2,
+        random_state=random_state
+    ).fit(x)
+    return model.labels_, model.cluster_centers_, float(model.inertia_)
+
+
+def _grow(x: np.ndarray, centroids: np.ndarray, labels: np.ndarray, metric: str) -> np.ndarray:
+    """Warm start for k+1: keep the k centroids and add the point farthest from its centroid."""
+    if metric == 'cosine':
+        distance = 1.0 - np.sum(x * centroids[labels], axis=1)
+    else:
+        distance = np.linalg.norm(x - centroids[labels], axis=1)
+    return np.vstack([centroids, x[np.argmax(distance)]])
+
+
+def choose_k(
+    x: np.ndarray,
+    k_min: int,
+    k_max: int,
+    metric: str = 'cosine',
+    sample_size: int = 1000,
+    budget_seconds: float = 1.5,
+    workers: int = 4,
+    random_state: int = 42
+) -> Dict[str, Any]:
+    """
+    Pick the number of clusters with the best silhouette score.
+
+    Args:
+        x: Vectors to cluster (n_samples, n_features)
+        k_min: Smallest k to try (at least 2)
+        k_max: Largest k to try (capped at sample size - 1)
+        metric: 'cosine' (spherical k-means) or 'euclidean' (KMeans)
+        sample_size: Points used for fitting and scoring
+        budget_seconds: No new k is started after this much time
+        workers: Parallel chains of consecutive k values
+        random_state: Seed for the subsample and the fits
+
+    Returns:
+        Dictionary with the chosen k, the score curve (k, silhouette, inertia),
+        sample size, elapsed milliseconds and whether the budget cut the sweep short
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}' (expected one of {', '.join(METRICS)})")
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(random_state)
+    x = np.asarray(x, dtype=np.float32)
+    if len(x) > sample_size:
+        x = x[rng.choice(len(x), sample_size, replace=False)]
+    if metric == 'cosine':
+        x = x / np.clip(np.linalg.norm(x, axis=1, keepdims=True), 1e-12, None)
+
+    k_values = list(range(max(2, k_min), min(k_max, len(x) - 1) + 1))
+    if not k_values:
+        return {'k': max(1, min(k_min, len(x))), 'curve': [], 'sample_size': len(x),
+                'elapsed_ms': 0.0, 'budget_exhausted': False}
+
+    distances = pairwise_distances(x, metric)
+    deadline = start + budget_seconds
+
+    def run_chain(chain: List[int]) -> List[Dict[str, Any]]:
+        results = []
+        centroids = labels = None
+        for k in chain:
+            # The first k of every chain always runs so each chain contributes a point
+            if results and time.perf_counter() > deadline:
+                break
+            init = None if centroids is None else _grow(x, centroids, labels, metric)
+            labels, centroids, inertia = _fit(x, k, init, metric, random_state)
+            contiguous = np.unique(labels, return_inverse=True)[1]
+            results.append({
+                'k': k,
+                'silhouette': round(silhouette_score_vectorized(distances, contiguous), 4),
+                'inertia': round(inertia, 4)
+            })
+        return results
+
+    chains = [[int(k) for k in chain] for chain in np.array_split(k_values, min(workers, len(k_values))) if len(chain)]
+    with ThreadPoolExecutor(max_workers=len(chains)) as pool:
+        curve = sorted((point for chain in pool.map(run_chain, chains) for point in chain), key=lambda p: p['k'])
+
+    best = max(curve, key=lambda p: p['silhouette'])
+    return {
+        'k': best['k'],
+        'curve': curve,
+        'sample_size': len(x),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+        'budget_exhausted': len(curve) < len(k_values)
+    }
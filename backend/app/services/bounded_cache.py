@@ -0,0 +1,240 @@
+"""
+Bounded Cache
+
+In-memory LRU cache bounded by approximate byte size, with TTL expiry,
+hit/miss/eviction counters and eviction listeners so dependent caches
+keyed by the same ID can be dropped together.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class BoundedCache:
+    """LRU cache with a byte budget, TTL expiry and eviction listeners."""
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        ttl_seconds: Optional[float],
+        size_of: Callable[[Any], int]
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            name: Cache name used in stats and log messages
+            max_bytes: Approximate byte budget for all entries
+            ttl_seconds: Entry lifetime in seconds (None disables expiry)
+            size_of: Function estimating the byte size of a value
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size_of = size_of
+
+        # key -> (value, size, created_at)
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[str], None]] = []
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def add_eviction_listener(self, listener: Callable[[str], None]):
+        """
+        Register a callback invoked with the key of every evicted, expired or popped entry.
+
+        Args:
+            listener: Callable taking the removed key
+        """
+        self._listeners.append(listener)
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        """Check whether an entry created at created_at has outlived the TTL."""
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _remove(self, key: str) -> Any:
+        """Remove an entry without notifying listeners (caller holds the lock)."""
+        value, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
+        return value
+
+    def _notify(self, keys: List[str]):
+        """Run eviction listeners outside the lock."""
+        for key in keys:
+            for listener in self._listeners:
+                try:
+                    listener(key)
+                except Exception as e:
+                    print(f"Error in {self.name} eviction listener for '{key}': {e}")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Retrieve a value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        expired = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[2], time.time()):
+                self._remove(key)
+                self.expirations += 1
+                expired = True
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+        if expired:
+            self._notify([key])
+        return default if entry is None else entry[0]
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value, evicting least recently used entries over the byte budget.
+
+        Replacing an existing key does not notify eviction listeners.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        size = self.size_of(value)
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.time())
+            self.total_bytes += size
+
+            # Always keep the newest entry, even if it alone exceeds the budget
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+                evicted.append(oldest_key)
+
+        if evicted:
+            print(f"{self.name}: evicted {len(evicted)} entries to stay under {self.max_bytes} bytes")
+            self._notify(evicted)
+
+    def update(self, key: str, transform: Callable[[Any], Any]) -> bool:
+        """
+        Replace an entry's value in place with transform(value).
+
+        The entry keeps its LRU position and creation time and no hit or miss is
+        counted, so housekeeping (e.g. shrinking an entry) doesn't make it look
+        recently used. Expired or absent entries are left alone.
+
+        Args:
+            key: Cache key
+            transform: Function mapping the current value to its replacement
+
+        Returns:
+            True if the entry was replaced
+        """
+        evicted = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry[2], time.time()):
+                return False
+            value, size, created_at = entry
+            new_value = transform(value)
+            new_size = self.size_of(new_value)
+            self._entries[key] = (new_value, new_size, created_at)
+            self.total_bytes += new_size - size
+
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+                evicted.append(oldest_key)
+
+        if evicted:
+            print(f"{self.name}: evicted {len(evicted)} entries to stay under {self.max_bytes} bytes")
+            self._notify(evicted)
+        return True
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """
+        Remove an entry and notify eviction listeners.
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is absent
+
+        Returns:
+            Removed value or default
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._remove(key)
+        self._notify([key])
+        return value
+
+    def sweep(self, max_age_seconds: Optional[float] = None) -> int:
+        """
+        Remove expired entries.
+
+        Args:
+            max_age_seconds: Age limit (defaults to the cache TTL)
+
+        Returns:
+            Number of entries removed
+        """
+        max_age = self.ttl_seconds if max_age_seconds is None else max_age_seconds
+        if max_age is None:
+            return 0
+
+        cutoff = time.time() - max_age
+        with self._lock:
+            expired = [key for key, (_, _, created_at) in self._entries.items() if created_at < cutoff]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+
+        self._notify(expired)
+        return len(expired)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry[2], time.time())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, byte usage and hit/miss/eviction counters
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
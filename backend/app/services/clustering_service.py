@@ -1,8 +1,39 @@
-import umap
+import os
+import time
 import numpy as np
-from sklearn.cluster import KMeans
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from app.config import settings
 from app.models import Story, ClusterData
+from app.services.bounded_cache import BoundedCache
+from app.services.auto_k import choose_k
+from app.services.spherical_kmeans import spherical_kmeans
+
+# Read by numba when it is first imported (lazily, with umap); an explicit environment variable wins
+os.environ.setdefault("NUMBA_THREADING_LAYER_PRIORITY", settings.NUMBA_THREADING_LAYER_PRIORITY)
+
+# Dimensionality reduction pipelines: UMAP on the raw embeddings, PCA pre-reduction
+# followed by UMAP, or PCA straight to 2D for fast previews
+REDUCTION_METHODS = ('umap', 'pca_umap', 'pca')
+
+# Spaces KMeans can run in: the 2D layout, the normalized embeddings, or their PCA projection
+CLUSTER_SPACES = ('2d', 'embedding', 'pca')
+
+# Predefined color palette, cycled when there are more clusters than colors
+CLUSTER_COLORS = [
+    '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
+    '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B739', '#52B788',
+    '#E63946', '#A8DADC', '#457B9D', '#F1FAEE', '#E76F51'
+]
+
+# How the cluster count is chosen when the request doesn't set one
+AUTO_K_MODES = ('table', 'sweep')
+
+# A cluster's radius for drift detection: this quantile of its members' distances to the centroid
+CLUSTER_RADIUS_QUANTILE = 0.95
+
+# Cluster cache entry fields referencing the live search; dropped when the search is evicted
+LIVE_FIELDS = ('stories', 'embeddings', 'columns')
+ENTRY_OVERHEAD_BYTES = 4096  # Stats dictionaries, keys and parameters of a cluster cache entry
 
 
 class ClusteringService:
@@ -10,27 +41,88 @@ class ClusteringService:
 
     def __init__(self):
         """Initialize clustering service."""
-        self.cluster_results: Dict[str, Dict[str, Any]] = {}
+        # One entry per search: references to its stories and embeddings plus the compact
+        # fitted model (layout, labels, reducers, centroids). When the search is evicted only
+        # the model stays, so a refreshed search can place its new stories without refitting
+        self.cluster_cache = BoundedCache(
+            name="cluster_cache",
+            max_bytes=settings.CLUSTER_CACHE_MAX_BYTES,
+            ttl_seconds=None,
+            size_of=self._estimate_entry_size
+        )
 
-    def reduce_dimensions(self, embeddings: np.ndarray) -> np.ndarray:
+    def pca_reduce(self, embeddings: np.ndarray, n_components: int) -> Tuple[np.ndarray, Any]:
         """
-        Reduce embeddings to 2D using UMAP.
+        Project embeddings onto their top principal components with randomized PCA.
 
         Args:
             embeddings: High-dimensional embeddings (n_samples, n_features)
+            n_components: Target dimensionality (capped by the data shape)
+
+        Returns:
+            Tuple of (reduced embeddings (n_samples, n_components), fitted PCA)
+        """
+        from sklearn.decomposition import PCA
+
+        n_components = max(1, min(n_components, embeddings.shape[0] - 1, embeddings.shape[1]))
+        pca = PCA(n_components=n_components, svd_solver='randomized', random_state=42)
+        reduced = pca.fit_transform(embeddings)
+        print(f"PCA reduction to {n_components} dims keeps {pca.explained_variance_ratio_.sum():.1%} of variance")
+        return reduced, pca
+
+    def reduce_dimensions(self, embeddings: np.ndarray, method: Optional[str] = None) -> np.ndarray:
+        """
+        Reduce embeddings to 2D.
+
+        Args:
+            embeddings: High-dimensional embeddings (n_samples, n_features)
+            method: 'umap', 'pca_umap' or 'pca' (defaults to CLUSTER_REDUCTION)
 
         Returns:
             2D embeddings (n_samples, 2)
         """
+        return self.fit_reduction(embeddings, method)[0]
+
+    def fit_reduction(self, embeddings: np.ndarray, method: Optional[str] = None) -> Tuple[np.ndarray, List[Any]]:
+        """
+        Reduce embeddings to 2D and keep the fitted reducers.
+
+        Args:
+            embeddings: High-dimensional embeddings (n_samples, n_features)
+            method: 'umap', 'pca_umap' or 'pca' (defaults to CLUSTER_REDUCTION)
+
+        Returns:
+            Tuple of (2D embeddings (n_samples, 2), fitted PCA/UMAP steps for transform_reduction)
+        """
+        method = method or settings.CLUSTER_REDUCTION
+        if method not in REDUCTION_METHODS:
+            raise ValueError(f"Unknown reduction method '{method}' (expected one of {', '.join(REDUCTION_METHODS)})")
+
         if len(embeddings) < 2:
-            return embeddings
+            return embeddings, []
+
+        if method == 'pca':
+            print(f"Reducing {embeddings.shape} to 2D using PCA...")
+            embedding_2d, pca = self.pca_reduce(embeddings, 2)
+            return embedding_2d, [pca]
+
+        # Embeddings are L2-normalized, so Euclidean distance after PCA tracks cosine distance
+        steps = []
+        metric = 'cosine'
+        if method == 'pca_umap' and embeddings.shape[1] > settings.CLUSTER_PCA_COMPONENTS:
+            embeddings, pca = self.pca_reduce(embeddings, settings.CLUSTER_PCA_COMPONENTS)
+            steps.append(pca)
+            metric = 'euclidean'
+
+        # Imported lazily: umap pulls in numba and takes seconds to import
+        import umap
 
         # Configure UMAP for dimensionality reduction
         reducer = umap.UMAP(
             n_components=2,
             n_neighbors=min(15, len(embeddings) - 1),  # Adjust for small datasets
             min_dist=0.1,
-            metric='cosine',
+            metric=metric,
             random_state=42
         )
 
@@ -38,7 +130,47 @@ class ClusteringService:
         embedding_2d = reducer.fit_transform(embeddings)
         print(f"UMAP reduction complete: {embedding_2d.shape}")
 
-        return embedding_2d
+        return embedding_2d, steps + [reducer]
+
+    def transform_reduction(self, steps: List[Any], embeddings: np.ndarray) -> np.ndarray:
+        """
+        Project new embeddings into an existing layout with its fitted reducers.
+
+        Args:
+            steps: Fitted PCA/UMAP steps from fit_reduction
+            embeddings: New high-dimensional embeddings (n_samples, n_features)
+
+        Returns:
+            2D embeddings (n_samples, 2)
+        """
+        for step in steps:
+            embeddings = step.transform(embeddings)
+        return embeddings
+
+    def trustworthiness_score(self, embeddings: np.ndarray, embedding_2d: np.ndarray) -> Optional[float]:
+        """
+        Measure how well the 2D layout preserves local neighbourhoods (1.0 is perfect).
+        Scored on a fixed random subsample since the metric is quadratic in the sample size.
+
+        Args:
+            embeddings: High-dimensional embeddings
+            embedding_2d: 2D embeddings from reduce_dimensions
+
+        Returns:
+            Trustworthiness in [0, 1], or None for too few samples
+        """
+        n_samples = len(embeddings)
+        n_neighbors = min(5, n_samples // 2 - 1)
+        if n_neighbors < 1:
+            return None
+
+        from sklearn.manifold import trustworthiness
+
+        sample = np.arange(n_samples)
+        if n_samples > settings.CLUSTER_TRUSTWORTHINESS_SAMPLE:
+            sample = np.random.default_rng(42).choice(n_samples, settings.CLUSTER_TRUSTWORTHINESS_SAMPLE, replace=False)
+        score = trustworthiness(embeddings[sample], embedding_2d[sample], n_neighbors=n_neighbors, metric='cosine')
+        return float(score)
 
     def cluster_kmeans(self, embedding_2d: np.ndarray, n_clusters: int) -> np.ndarray:
         """
@@ -55,6 +187,8 @@ class ClusteringService:
         n_clusters = min(n_clusters, len(embedding_2d))
         n_clusters = max(2, n_clusters)  # At least 2 clusters
 
+        from sklearn.cluster import KMeans
+
         clusterer = KMeans(
             n_clusters=n_clusters,
             random_state=42,
@@ -67,6 +201,214 @@ class ClusteringService:
 
         return labels
 
+    def cluster_vectors(
+        self,
+        embeddings: np.ndarray,
+        embedding_2d: np.ndarray,
+        space: str
+    ) -> Tuple[np.ndarray, List[Any]]:
+        """
+        Get the vectors clustering runs on for a cluster space.
+
+        Args:
+            embeddings: High-dimensional embeddings (n_samples, n_features)
+            embedding_2d: 2D layout from reduce_dimensions
+            space: '2d', 'embedding' or 'pca'
+
+        Returns:
+            Tuple of (vectors to cluster (n_samples, n_dims), fitted steps mapping
+            new embeddings into the 'pca' space)
+        """
+        if space == '2d':
+            return embedding_2d, []
+        if space == 'pca' and embeddings.shape[1] > settings.CLUSTER_PCA_COMPONENTS:
+            vectors, pca = self.pca_reduce(embeddings, settings.CLUSTER_PCA_COMPONENTS)
+            return vectors, [pca]
+        return embeddings, []
+
+    def cluster_centroids(self, vectors: np.ndarray, labels: np.ndarray, metric: str) -> np.ndarray:
+        """
+        Compute the centroid of every label.
+
+        Args:
+            vectors: Clustered vectors (n_samples, n_dims)
+            labels: Cluster label of each vector
+            metric: 'cosine' (unit-norm mean direction) or 'euclidean' (mean)
+
+        Returns:
+            Centroids (max label + 1, n_dims); rows of empty labels are zero
+        """
+        from scipy.sparse import csr_matrix
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if metric == 'cosine':
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        n_labels = int(labels.max()) + 1
+        membership = csr_matrix(
+            (np.ones(len(labels), dtype=vectors.dtype), (labels, np.arange(len(labels)))),
+            shape=(n_labels, len(labels))
+        )
+        centroids = np.asarray(membership @ vectors)
+        if metric == 'cosine':
+            return centroids / np.clip(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12, None)
+        return centroids / np.maximum(np.bincount(labels, minlength=n_labels), 1)[:, None]
+
+    def assign_to_centroids(
+        self,
+        vectors: np.ndarray,
+        centroids: np.ndarray,
+        metric: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assign vectors to their nearest centroid.
+
+        Args:
+            vectors: Vectors in the cluster space (n_samples, n_dims)
+            centroids: Centroids from cluster_centroids
+            metric: 'cosine' or 'euclidean'
+
+        Returns:
+            Tuple of (labels, distance of each vector to its centroid)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if metric == 'cosine':
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+            distances = 1.0 - vectors @ centroids.T
+        else:
+            distances = np.linalg.norm(vectors[:, None, :] - centroids[None, :, :], axis=2)
+        # Labels left without members have zero centroids and must never win
+        distances[:, ~centroids.any(axis=1)] = np.inf
+        labels = distances.argmin(axis=1)
+        return labels, distances[np.arange(len(vectors)), labels]
+
+    def topic_distances(self, embeddings: np.ndarray, topic_centroids: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        """
+        Cosine distance of each embedding to the embedding-space centroid of its cluster.
+
+        Args:
+            embeddings: High-dimensional embeddings (n_samples, n_features)
+            topic_centroids: cluster_centroids of the embeddings with the cosine metric
+            labels: Cluster label of each embedding
+
+        Returns:
+            Distances (n_samples,)
+        """
+        embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return 1.0 - np.sum(embeddings * topic_centroids[labels], axis=1)
+
+    def held_out_distances(self, embeddings: np.ndarray, labels: np.ndarray, n_labels: int) -> np.ndarray:
+        """
+        Leave-one-out cosine distance of each embedding to the centroid of the rest of its cluster.
+
+        Members pull their own centroid towards them, so distances to the full centroid
+        underestimate how far an unseen story of the same topic lands; held-out distances
+        make cluster_radii comparable with the distances of new stories.
+
+        Args:
+            embeddings: High-dimensional embeddings (n_samples, n_features)
+            labels: Cluster label of each embedding
+            n_labels: Number of centroid rows
+
+        Returns:
+            Distances (n_samples,); 1.0 for members of single-story clusters
+        """
+        from scipy.sparse import csr_matrix
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        membership = csr_matrix(
+            (np.ones(len(labels), dtype=embeddings.dtype), (labels, np.arange(len(labels)))),
+            shape=(n_labels, len(labels))
+        )
+        rest = np.asarray(membership @ embeddings)[labels] - embeddings
+        norms = np.linalg.norm(rest, axis=1)
+        similarity = np.sum(embeddings * rest, axis=1) / np.clip(norms, 1e-12, None)
+        return np.where(norms > 1e-6, 1.0 - similarity, 1.0)
+
+    def cluster_radii(self, labels: np.ndarray, distances: np.ndarray, n_labels: int) -> np.ndarray:
+        """
+        Compute each cluster's radius as a quantile of its members' centroid distances.
+
+        Args:
+            labels: Cluster label of each vector
+            distances: Distance of each vector to its cluster centroid
+            n_labels: Number of centroid rows
+
+        Returns:
+            Radius per label (0 for empty labels)
+        """
+        # Sort by (label, distance) so each cluster's distances form one ascending run
+        order = np.lexsort((distances, labels))
+        counts = np.bincount(labels, minlength=n_labels)
+        starts = np.cumsum(counts) - counts
+        positions = starts + np.floor(CLUSTER_RADIUS_QUANTILE * np.maximum(counts - 1, 0)).astype(np.int64)
+        radii = distances[order][np.minimum(positions, len(distances) - 1)]
+        return np.where(counts > 0, radii, 0.0)
+
+    def cluster_spherical(self, vectors: np.ndarray, n_clusters: int) -> np.ndarray:
+        """
+        Cluster high-dimensional vectors with spherical k-means (cosine similarity).
+
+        Args:
+            vectors: Embeddings or their PCA projection (n_samples, n_dims)
+            n_clusters: Number of clusters
+
+        Returns:
+            Cluster labels array (contiguous from 0)
+        """
+        n_clusters = max(2, min(n_clusters, len(vectors)))
+
+        print(f"Clustering {vectors.shape} with spherical k-means (n_clusters={n_clusters})...")
+        labels, _, _ = spherical_kmeans(vectors, n_clusters)
+        # Renumber so labels stay contiguous if a cluster ended up empty
+        labels = np.unique(labels, return_inverse=True)[1]
+        print(f"Spherical k-means complete: {labels.max() + 1} clusters")
+
+        return labels
+
+    def import_backend(self):
+        """Import UMAP and scikit-learn (kept out of module import for fast startup)."""
+        import umap  # noqa: F401
+        import sklearn.cluster  # noqa: F401
+        import sklearn.decomposition  # noqa: F401
+        import sklearn.manifold  # noqa: F401
+
+    def warmup(self):
+        """
+        Run UMAP and KMeans on a small random dataset so numba compilation
+        happens at startup instead of on the first clustering request.
+        """
+        rng = np.random.default_rng(42)
+        dummy = rng.standard_normal((64, 384)).astype(np.float32)
+        dummy /= np.linalg.norm(dummy, axis=1, keepdims=True)
+        embedding_2d, steps = self.fit_reduction(dummy, 'pca_umap')
+        self.cluster_kmeans(embedding_2d, 4)
+        # UMAP's transform compiles its own kernels; incremental clustering uses it
+        self.transform_reduction(steps, dummy[:4])
+
+    def select_k(self, vectors: np.ndarray, metric: str) -> Dict[str, Any]:
+        """
+        Choose the number of clusters with a parallel silhouette sweep within the latency budget.
+
+        Args:
+            vectors: Vectors that will be clustered
+            metric: 'cosine' for spherical k-means, 'euclidean' for KMeans on the 2D layout
+
+        Returns:
+            Dictionary with the chosen k and the silhouette/inertia curve
+        """
+        result = choose_k(
+            vectors,
+            k_min=settings.CLUSTER_K_MIN,
+            k_max=settings.CLUSTER_K_MAX,
+            metric=metric,
+            sample_size=settings.CLUSTER_AUTO_K_SAMPLE,
+            budget_seconds=settings.CLUSTER_AUTO_K_BUDGET_MS / 1000,
+            workers=settings.CLUSTER_AUTO_K_WORKERS
+        )
+        print(f"Auto-k sweep chose k={result['k']} from {len(result['curve'])} candidates in {result['elapsed_ms']:.0f} ms")
+        return result
+
     def determine_optimal_clusters(self, n_samples: int) -> int:
         """
         Determine optimal number of clusters based on sample size.
@@ -101,29 +443,115 @@ class ClusteringService:
         Returns:
             Dictionary mapping cluster labels to hex color codes
         """
-        # Predefined color palette
-        colors = [
-            '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
-            '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B739', '#52B788',
-            '#E63946', '#A8DADC', '#457B9D', '#F1FAEE', '#E76F51'
-        ]
-
         # Create color map
         color_map = {}
 
         # Assign colors to clusters (KMeans doesn't have noise points, so all labels are >= 0)
         for i in range(n_clusters):
-            color_map[i] = colors[i % len(colors)]
+            color_map[i] = CLUSTER_COLORS[i % len(CLUSTER_COLORS)]
 
         return color_map
 
+    def story_columns(self, stories: List[Story]) -> Dict[str, Any]:
+        """
+        Collect the story fields used for visualization into columns in one pass.
+
+        Args:
+            stories: List of Story objects
+
+        Returns:
+            Dictionary with 'texts', 'ids' and 'urls' lists and a 'scores' array
+        """
+        return {
+            # Use title if available, otherwise text
+            'texts': [story.title or story.text for story in stories],
+            'ids': [story.id for story in stories],
+            'urls': [story.url or story.hn_url for story in stories],
+            'scores': np.fromiter((story.score for story in stories), dtype=np.float64, count=len(stories))
+        }
+
+    def cluster_info(self, labels: np.ndarray, scores: np.ndarray) -> Dict[int, Dict[str, Any]]:
+        """
+        Summarize every non-empty cluster with grouped NumPy reductions.
+
+        Args:
+            labels: Cluster label of each story
+            scores: Score of each story
+
+        Returns:
+            Dictionary mapping label to size, average score and display label
+        """
+        labels = np.asarray(labels, dtype=np.int64)
+        n_clusters = int(labels.max()) + 1 if len(labels) else 0
+        sizes = np.bincount(labels, minlength=n_clusters)
+        score_sums = np.bincount(labels, weights=scores, minlength=n_clusters)
+        avg_scores = score_sums / np.maximum(sizes, 1)
+
+        return {
+            label: {
+                'size': int(sizes[label]),
+                'avg_likes': float(avg_scores[label]),  # Keep field name for compatibility
+                'label': f"Cluster {label}"
+            }
+            for label in np.flatnonzero(sizes).tolist()
+        }
+
+    def embedding_fingerprints(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Project embeddings onto a fixed random direction.
+
+        Four bytes per story are enough to tell whether a story's embedding
+        changed (e.g. a different embedding mode) without keeping a copy.
+
+        Args:
+            embeddings: High-dimensional embeddings (n_samples, n_features)
+
+        Returns:
+            Fingerprints (n_samples,) as float32
+        """
+        direction = np.random.default_rng(0).standard_normal(embeddings.shape[1])
+        direction /= np.linalg.norm(direction)
+        return (embeddings @ direction).astype(np.float32)
+
+    def build_cluster_data(self, embedding_2d: np.ndarray, labels: np.ndarray, columns: Dict[str, Any]) -> ClusterData:
+        """
+        Build visualization data with grouped NumPy reductions over the story columns.
+
+        Args:
+            embedding_2d: 2D embeddings (n_samples, 2)
+            labels: Cluster label of each story (contiguous from 0)
+            columns: Story columns from story_columns
+
+        Returns:
+            ClusterData object for visualization
+        """
+        labels = np.asarray(labels, dtype=np.int64)
+        cluster_info = self.cluster_info(labels, columns['scores'])
+
+        palette = np.array(CLUSTER_COLORS)
+        # Every field already has its final type, so skip per-element validation
+        return ClusterData.model_construct(
+            x=embedding_2d[:, 0].tolist(),
+            y=embedding_2d[:, 1].tolist(),
+            cluster_labels=labels.tolist(),
+            story_texts=columns['texts'],
+            story_ids=columns['ids'],
+            story_urls=columns['urls'],
+            colors=palette[labels % len(palette)].tolist(),
+            cluster_info=cluster_info
+        )
+
     def analyze_and_cluster(
         self,
         search_id: str,
         embeddings: np.ndarray,
         stories: List[Story],
         algorithm: str = 'kmeans',
-        n_clusters: int = None
+        n_clusters: int = None,
+        reduction: Optional[str] = None,
+        cluster_space: Optional[str] = None,
+        auto_k: Optional[str] = None,
+        base_search_id: Optional[str] = None
     ) -> ClusterData:
         """
         Perform complete analysis: dimensionality reduction and clustering.
@@ -134,168 +562,341 @@ class ClusteringService:
             stories: List of Story objects
             algorithm: Clustering algorithm (only 'kmeans' is supported)
             n_clusters: Number of clusters (auto-determined if not provided)
+            reduction: 'umap', 'pca_umap' or 'pca' (defaults to CLUSTER_REDUCTION)
+            cluster_space: '2d', 'embedding' or 'pca' (defaults to CLUSTER_SPACE)
+            auto_k: 'table' or 'sweep' when n_clusters is not given (defaults to CLUSTER_AUTO_K)
+            base_search_id: Earlier search of the same query whose clusters seed incremental
+                placement when search_id has not been clustered yet (e.g. after a refresh)
 
         Returns:
             ClusterData object for visualization
         """
-        # Reduce dimensions to 2D
-        embedding_2d = self.reduce_dimensions(embeddings)
-
-        # Determine number of clusters if not provided
+        reduction = reduction or settings.CLUSTER_REDUCTION
+        cluster_space = cluster_space or settings.CLUSTER_SPACE
+        if cluster_space not in CLUSTER_SPACES:
+            raise ValueError(f"Unknown cluster space '{cluster_space}' (expected one of {', '.join(CLUSTER_SPACES)})")
+        auto_k = auto_k or settings.CLUSTER_AUTO_K
+        if auto_k not in AUTO_K_MODES:
+            raise ValueError(f"Unknown auto_k mode '{auto_k}' (expected one of {', '.join(AUTO_K_MODES)})")
+
+        # The layout and the labels are cached separately: labels computed outside
+        # the 2D space survive a layout change and vice versa
+        layout_key = reduction
+        label_key = (algorithm, n_clusters, cluster_space)
+        if cluster_space == '2d':
+            label_key += (reduction,)
         if n_clusters is None:
-            n_clusters = self.determine_optimal_clusters(len(embedding_2d))
-            print(f"Auto-determining clusters: {n_clusters}")
-
-        # Perform clustering (only KMeans is supported)
-        if algorithm != 'kmeans':
-            print(f"Warning: Only 'kmeans' algorithm is supported. Using KMeans instead of '{algorithm}'.")
-        
-        labels = self.cluster_kmeans(embedding_2d, n_clusters)
-
-        # Generate color map
-        unique_labels = set(labels)
-        n_clusters_found = len(unique_labels)
-        color_map = self.generate_colors(n_clusters_found)
-
-        # Prepare cluster info
-        cluster_info = {}
-        for label in unique_labels:
-            cluster_stories_list = [stories[i] for i, l in enumerate(labels) if l == label]
-            # Calculate average score (support both score and likes fields)
-            avg_score = 0
-            if cluster_stories_list:
-                scores = []
-                for s in cluster_stories_list:
-                    if hasattr(s, 'score'):
-                        scores.append(s.score)
-                    elif hasattr(s, 'likes'):
-                        scores.append(s.likes)
-                avg_score = sum(scores) / len(scores) if scores else 0
-            
-            cluster_info[int(label)] = {
-                'size': len(cluster_stories_list),
-                'avg_likes': avg_score,  # Keep field name for compatibility
-                'label': f"Cluster {label}"
-            }
+            label_key += (auto_k,)
+
+        if len(embeddings) != len(stories):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(stories)} stories; regenerate embeddings")
+
+        # A detached entry (search evicted) or the base search's entry only serves incremental updates
+        model = self.cluster_cache.get(search_id)
+        if model is None and base_search_id is not None:
+            model = self.cluster_cache.get(base_search_id)
+        cached = model or {}
+        if cached.get('stories') is not stories or cached.get('embeddings') is not embeddings:
+            cached = {}
+        if cached.get('layout_key') == layout_key and cached.get('label_key') == label_key:
+            print(f"Using cached clusters for search_id: {search_id}")
+            return self.build_cluster_data(cached['embedding_2d'], cached['labels'], cached['columns'])
+
+        # Story columns only depend on the story list, so reuse them across re-clusterings
+        columns = cached.get('columns') or self.story_columns(stories)
+        params = {
+            'algorithm': algorithm,
+            'n_clusters': n_clusters,
+            'reduction': reduction,
+            'cluster_space': cluster_space,
+            'auto_k': auto_k
+        }
+
+        # New stories for a search clustered before (e.g. after a refresh) are placed into
+        # the fitted layout and clusters, unless too many are new or they don't fit well
+        if not cached and settings.CLUSTER_INCREMENTAL and model is not None \
+                and model['layout_key'] == layout_key and model['label_key'] == label_key:
+            result = self.update_incremental(model, embeddings, stories, columns)
+            if result is not None:
+                self.cluster_cache.set(search_id, result)
+                return self.build_cluster_data(result['embedding_2d'], result['labels'], columns)
 
-        # Create ClusterData for visualization
-        # Use title if available, otherwise text
-        story_texts = []
-        for story in stories:
-            if hasattr(story, 'title') and story.title:
-                story_texts.append(story.title)
+        # Reduce dimensions to 2D
+        if cached.get('layout_key') == layout_key:
+            print(f"Using cached {reduction} layout for search_id: {search_id}")
+            embedding_2d = cached['embedding_2d']
+            reducers = cached['reducers']
+            reduction_stats = cached['reduction_stats']
+        else:
+            start = time.perf_counter()
+            embedding_2d, reducers = self.fit_reduction(embeddings, reduction)
+            reduction_stats = {
+                'method': reduction,
+                'n_samples': len(embeddings),
+                'latency_ms': round((time.perf_counter() - start) * 1000, 1),
+                'trustworthiness': None
+            }
+            if settings.CLUSTER_TRUSTWORTHINESS and len(embeddings) >= 2:
+                reduction_stats['trustworthiness'] = self.trustworthiness_score(embeddings, embedding_2d)
+            print(f"Reduction stats: {reduction_stats}")
+
+        metric = 'euclidean' if cluster_space == '2d' else 'cosine'
+        if cached.get('label_key') == label_key:
+            print(f"Using cached cluster labels for search_id: {search_id}")
+            labels = cached['labels']
+            space_reducers = cached['space_reducers']
+            centroids = cached['centroids']
+            topic_centroids = cached['topic_centroids']
+            radii = cached['radii']
+            clustering_stats = cached['clustering_stats']
+        else:
+            start = time.perf_counter()
+            vectors, space_reducers = self.cluster_vectors(embeddings, embedding_2d, cluster_space)
+
+            # Determine number of clusters if not provided
+            auto_k_result = None
+            if n_clusters is None and auto_k == 'sweep':
+                auto_k_result = self.select_k(vectors, metric)
+                n_clusters = auto_k_result['k']
+            elif n_clusters is None:
+                n_clusters = self.determine_optimal_clusters(len(embeddings))
+                print(f"Auto-determining clusters: {n_clusters}")
+
+            # Perform clustering (only KMeans is supported)
+            if algorithm != 'kmeans':
+                print(f"Warning: Only 'kmeans' algorithm is supported. Using KMeans instead of '{algorithm}'.")
+
+            if cluster_space == '2d':
+                labels = self.cluster_kmeans(vectors, n_clusters)
             else:
-                story_texts.append(story.text)
-        
-        cluster_data = ClusterData(
-            x=embedding_2d[:, 0].tolist(),
-            y=embedding_2d[:, 1].tolist(),
-            cluster_labels=[int(l) for l in labels],
-            story_texts=story_texts,
-            story_ids=[story.id for story in stories],
-            story_urls=[story.url or story.hn_url for story in stories],
-            colors=[color_map[int(l)] for l in labels],
-            cluster_info=cluster_info
-        )
+                labels = self.cluster_spherical(vectors, n_clusters)
+
+            # Centroids let later refreshes assign new stories; topic centroids and radii in
+            # the embedding space (whatever the cluster space) detect stories that fit no cluster.
+            # Radii come from held-out distances, the distances new stories will be measured by
+            centroids = self.cluster_centroids(vectors, labels, metric)
+            topic_centroids = self.cluster_centroids(embeddings, labels, 'cosine')
+            radii = self.cluster_radii(labels, self.held_out_distances(embeddings, labels, len(centroids)),
+                                       len(centroids))
+            clustering_stats = {
+                'space': cluster_space,
+                'n_clusters': int(len(set(labels))),
+                'latency_ms': round((time.perf_counter() - start) * 1000, 1),
+                'auto_k': auto_k_result
+            }
 
-        # Cache results
-        self.cluster_results[search_id] = {
-            'cluster_data': cluster_data,
+        # Cache results: the search's stories and embeddings by reference, arrays in compact dtypes
+        labels = self.compact_labels(labels)
+        embedding_2d = np.asarray(embedding_2d, dtype=np.float32)
+        result = {
+            'stories': stories,
+            'embeddings': embeddings,
+            'columns': columns,
+            'story_ids': columns['ids'],
             'labels': labels,
             'embedding_2d': embedding_2d,
-            'embeddings': embeddings,
-            'stories': stories
+            'embedding_dim': embeddings.shape[1],
+            'fingerprints': self.embedding_fingerprints(embeddings),
+            'layout_key': layout_key,
+            'label_key': label_key,
+            'params': params,
+            'reduction_stats': reduction_stats,
+            'clustering_stats': clustering_stats,
+            'reducers': reducers,
+            'space_reducers': space_reducers,
+            'metric': metric,
+            'centroids': centroids.astype(np.float32),
+            'topic_centroids': topic_centroids.astype(np.float32),
+            'radii': radii.astype(np.float32),
+            'fit_count': len(embeddings),
+            'added_since_fit': 0
         }
+        self.cluster_cache.set(search_id, result)
+
+        return self.build_cluster_data(embedding_2d, labels, columns)
+
+    def compact_labels(self, labels: np.ndarray) -> np.ndarray:
+        """
+        Store cluster labels as int16 (int32 if there are more labels than int16 holds).
+
+        Args:
+            labels: Cluster label of each story
+
+        Returns:
+            Labels in the smallest fitting dtype
+        """
+        labels = np.asarray(labels)
+        dtype = np.int16 if len(labels) == 0 or labels.max() <= np.iinfo(np.int16).max else np.int32
+        return labels.astype(dtype)
+
+    def update_incremental(
+        self,
+        model: Dict[str, Any],
+        embeddings: np.ndarray,
+        stories: List[Story],
+        columns: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update a previous clustering with a new story list without refitting.
 
-        return cluster_data
+        Stories seen before keep their coordinates and labels; new stories are
+        projected with the fitted reducers and assigned to the nearest centroid.
+        Returns None when a full refit is due: too many stories were added since
+        the last fit, or too many new stories fall outside the radius of their
+        cluster (drift).
+
+        Args:
+            model: Cluster cache entry of the last clustering of the search (possibly detached)
+            embeddings: Embeddings of the new story list
+            stories: New story list
+            columns: story_columns of the new story list
 
-    def calculate_cluster_graph(self, search_id: str) -> Dict[str, Any]:
+        Returns:
+            Cluster cache entry, or None if a refit is needed
+        """
+        start = time.perf_counter()
+        previous_rows = {story_id: row for row, story_id in enumerate(model['story_ids'])}
+        rows = np.fromiter((previous_rows.get(story_id, -1) for story_id in columns['ids']), dtype=np.int64,
+                           count=len(stories))
+        known = np.flatnonzero(rows >= 0)
+        new = np.flatnonzero(rows < 0)
+
+        added = model['added_since_fit'] + len(new)
+        if added > settings.CLUSTER_REFIT_NEW_FRACTION * model['fit_count']:
+            print(f"Refitting clusters: {added} stories added since the last fit of {model['fit_count']}")
+            return None
+        # Embeddings of known stories change when the embedding mode or model does
+        fingerprints = self.embedding_fingerprints(embeddings)
+        if embeddings.shape[1] != model['embedding_dim'] or \
+                not np.allclose(fingerprints[known], model['fingerprints'][rows[known]], atol=1e-3):
+            print("Refitting clusters: embeddings of known stories changed")
+            return None
+
+        embedding_2d = np.empty((len(stories), 2), dtype=np.float32)
+        labels = np.empty(len(stories), dtype=model['labels'].dtype)
+        embedding_2d[known] = model['embedding_2d'][rows[known]]
+        labels[known] = model['labels'][rows[known]]
+
+        drift = 0.0
+        if len(new):
+            embedding_2d[new] = self.transform_reduction(model['reducers'], embeddings[new])
+            if model['params']['cluster_space'] == '2d':
+                vectors = embedding_2d[new]
+            else:
+                vectors = self.transform_reduction(model['space_reducers'], embeddings[new])
+            labels[new] = self.assign_to_centroids(vectors, model['centroids'], model['metric'])[0]
+            distances = self.topic_distances(embeddings[new], model['topic_centroids'], labels[new])
+            drift = float(np.mean(distances > model['radii'][labels[new]]))
+            if drift > settings.CLUSTER_DRIFT_THRESHOLD:
+                print(f"Refitting clusters: {drift:.0%} of new stories fall outside their cluster")
+                return None
+
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        print(f"Incremental clustering: {len(new)} new stories assigned in {latency_ms:.1f} ms")
+        return {
+            **model,
+            'stories': stories,
+            'embeddings': embeddings,
+            'columns': columns,
+            'story_ids': columns['ids'],
+            'labels': labels,
+            'embedding_2d': embedding_2d,
+            'fingerprints': fingerprints,
+            'reduction_stats': {**model['reduction_stats'], 'n_samples': len(stories), 'latency_ms': latency_ms,
+                                'incremental': True},
+            'clustering_stats': {**model['clustering_stats'], 'n_clusters': int(len(np.unique(labels))),
+                                 'latency_ms': latency_ms, 'incremental': True, 'new_points': int(len(new)),
+                                 'drift': round(drift, 4)},
+            'added_since_fit': added
+        }
+
+    def calculate_cluster_graph(
+        self,
+        search_id: str,
+        top_k: Optional[int] = None,
+        min_similarity: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Calculate cluster-to-cluster similarity graph for knowledge graph visualization.
 
         Args:
             search_id: Search ID with cached cluster results
+            top_k: Keep only each cluster's top_k most similar neighbours (None keeps all)
+            min_similarity: Drop edges below this similarity in [0, 1] (None keeps all)
 
         Returns:
             Dictionary with nodes and edges for graph visualization
         """
-        cached = self.cluster_results.get(search_id, {})
+        cached = self.get_cluster_results(search_id)
         if not cached:
             raise ValueError(f"No cluster results found for search_id: {search_id}")
 
         labels = cached.get('labels')
         embeddings = cached.get('embeddings')
-        cluster_data = cached.get('cluster_data')
-        stories = cached.get('stories')
 
         if labels is None or embeddings is None:
             raise ValueError("Missing cluster or embedding data")
 
-        # Get unique cluster labels
-        unique_clusters = sorted(set(int(l) for l in labels))
+        # Group stories by cluster with one stable sort: cluster c owns order[starts[c]:starts[c] + sizes[c]]
+        labels = np.asarray(labels, dtype=np.int64)
+        order = np.argsort(labels, kind='stable')
+        unique_clusters, starts, sizes = np.unique(labels[order], return_index=True, return_counts=True)
         n_clusters = len(unique_clusters)
 
-        # Normalize embeddings (L2 normalization)
+        # Centroids as the mean of L2-normalized embeddings: one sparse (clusters x stories)
+        # membership matrix times the embeddings sums every cluster at once
+        from scipy.sparse import csr_matrix
+
         normalized_embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        cluster_rows = np.searchsorted(unique_clusters, labels)
+        membership = csr_matrix(
+            (np.ones(len(labels), dtype=normalized_embeddings.dtype), (cluster_rows, np.arange(len(labels)))),
+            shape=(n_clusters, len(labels))
+        )
+        centroids = np.asarray(membership @ normalized_embeddings) / sizes[:, None]
+
+        # Pairwise centroid similarity, mapped from [-1, 1] to [0, 1]
+        similarity = np.clip((centroids @ centroids.T + 1) / 2, 0, 1)
+
+        keep = np.ones((n_clusters, n_clusters), dtype=bool)
+        if top_k is not None and top_k < n_clusters - 1:
+            # An edge survives if it is among the top_k of either endpoint
+            ranked = similarity.copy()
+            np.fill_diagonal(ranked, -np.inf)
+            neighbours = np.argpartition(-ranked, top_k - 1, axis=1)[:, :top_k]
+            keep = np.zeros_like(keep)
+            keep[np.arange(n_clusters)[:, None], neighbours] = True
+            keep |= keep.T
+        if min_similarity is not None:
+            keep &= similarity >= min_similarity
+
+        # Upper triangle only (the matrix is symmetric)
+        rows, cols = np.triu_indices(n_clusters, k=1)
+        mask = keep[rows, cols]
+        rows, cols = rows[mask], cols[mask]
+        edges = [
+            {'source': source, 'target': target, 'similarity': value}
+            for source, target, value in zip(
+                unique_clusters[rows].tolist(), unique_clusters[cols].tolist(), similarity[rows, cols].tolist()
+            )
+        ]
 
-        # Calculate cluster centroids in embedding space
-        cluster_centroids = {}
-        cluster_sizes = {}
-        cluster_colors = {}
-        cluster_story_ids = {}  # Store story IDs for each cluster
-        
-        for cluster_id in unique_clusters:
-            # Get all stories in this cluster
-            cluster_indices = np.where(labels == cluster_id)[0]
-            cluster_sizes[cluster_id] = len(cluster_indices)
-            
-            # Get story IDs for this cluster
-            cluster_story_ids[cluster_id] = [stories[idx].id for idx in cluster_indices]
-            
-            # Calculate centroid as mean of normalized embeddings
-            cluster_centroids[cluster_id] = normalized_embeddings[cluster_indices].mean(axis=0)
-            
-            # Get color from cluster_data
-            if cluster_data:
-                for idx in cluster_indices:
-                    if idx < len(cluster_data.colors):
-                        cluster_colors[cluster_id] = cluster_data.colors[idx]
-                        break
-
-        # Calculate pairwise cosine similarity between cluster centroids
-        edges = []
-        for i, cluster_i in enumerate(unique_clusters):
-            for j, cluster_j in enumerate(unique_clusters):
-                if i < j:  # Only compute upper triangle (symmetric)
-                    # Cosine similarity
-                    similarity = np.dot(
-                        cluster_centroids[cluster_i],
-                        cluster_centroids[cluster_j]
-                    )
-                    # Clamp to [0, 1] range
-                    similarity = max(0, min(1, (similarity + 1) / 2))  # Normalize from [-1, 1] to [0, 1]
-                    
-                    edges.append({
-                        'source': int(cluster_i),
-                        'target': int(cluster_j),
-                        'similarity': float(similarity)
-                    })
+        # Story IDs for each cluster (for summary generation), in original story order
+        columns = cached['columns']
+        grouped_ids = np.split(np.asarray(columns['ids'], dtype=object)[order], starts[1:])
+        cluster_info = self.cluster_info(labels, columns['scores'])
 
         # Create nodes with metadata
         nodes = []
-        for cluster_id in unique_clusters:
-            # Get cluster label from cluster_data
-            cluster_label = f"Cluster {cluster_id}"
-            if cluster_data and cluster_id in cluster_data.cluster_info:
-                cluster_label = cluster_data.cluster_info[cluster_id].get('label', cluster_label)
-            
+        for position, cluster_id in enumerate(unique_clusters.tolist()):
+            info = cluster_info[cluster_id]
             nodes.append({
-                'id': int(cluster_id),
-                'label': cluster_label,
-                'size': cluster_sizes[cluster_id],
-                'color': cluster_colors.get(cluster_id, '#808080'),
-                'avg_engagement': cluster_data.cluster_info[cluster_id].get('avg_likes', 0) if cluster_data else 0,
-                'story_ids': cluster_story_ids[cluster_id]  # Add story IDs for summary generation
+                'id': cluster_id,
+                'label': info['label'],
+                'size': int(sizes[position]),
+                'color': CLUSTER_COLORS[cluster_id % len(CLUSTER_COLORS)],
+                'avg_engagement': info['avg_likes'],
+                'story_ids': grouped_ids[position].tolist()
             })
 
         return {
@@ -312,9 +913,90 @@ class ClusteringService:
             search_id: Search ID
 
         Returns:
-            Cluster results dictionary
+            Cluster cache entry (empty if the search's stories were evicted)
+        """
+        entry = self.cluster_cache.get(search_id)
+        return entry if entry is not None and 'stories' in entry else {}
+
+    def get_cluster_params(self, search_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the clustering parameters last used for a search, kept across refreshes.
+
+        Args:
+            search_id: Search ID
+
+        Returns:
+            analyze_and_cluster keyword arguments, or None if the search was never clustered
+        """
+        entry = self.cluster_cache.get(search_id)
+        return dict(entry['params']) if entry is not None else None
+
+    def clear_cluster_results(self, search_id: str):
+        """
+        Clear cached cluster results for a search.
+
+        The references to the search's stories and embeddings are dropped; the
+        compact fitted model is kept for incremental re-clustering.
+
+        Args:
+            search_id: Search ID to clear
+        """
+        if settings.CLUSTER_INCREMENTAL:
+            # Detach in place: the model of an evicted search must not look recently used
+            self.cluster_cache.update(
+                search_id,
+                lambda entry: {key: value for key, value in entry.items() if key not in LIVE_FIELDS}
+            )
+        else:
+            self.cluster_cache.pop(search_id)
+
+    def _estimate_entry_size(self, entry: Dict[str, Any]) -> int:
+        """
+        Estimate the memory held by a cluster cache entry in bytes.
+
+        Stories and embeddings belong to the search and embedding caches, so only
+        the column lists pointing at them are counted; story IDs, fitted arrays
+        and reducers (including training data they keep) are counted in full.
+
+        Args:
+            entry: Cluster cache entry
+
+        Returns:
+            Approximate size in bytes
+        """
+        seen = set()
+        size = ENTRY_OVERHEAD_BYTES + sum(len(story_id) + 57 for story_id in entry['story_ids'])
+        if 'columns' in entry:
+            seen.update((id(entry['stories']), id(entry['embeddings'])))
+            size += 2 * 8 * len(entry['story_ids']) + entry['columns']['scores'].nbytes
+        model = [value for key, value in entry.items() if key not in LIVE_FIELDS and key != 'story_ids']
+        return size + self._estimate_object_size(model, seen)
+
+    def _estimate_object_size(self, obj: Any, seen: set, depth: int = 0) -> int:
+        """Sum the NumPy and SciPy sparse buffers reachable from obj (e.g. a fitted UMAP)."""
+        if id(obj) in seen or depth > 6:
+            return 0
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            return obj.nbytes
+        if all(hasattr(obj, name) for name in ('data', 'indices', 'indptr')):
+            return obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes
+        if isinstance(obj, (list, tuple)):
+            return sum(self._estimate_object_size(item, seen, depth + 1) for item in obj)
+        if isinstance(obj, dict):
+            return sum(self._estimate_object_size(item, seen, depth + 1) for item in obj.values())
+        if hasattr(obj, '__dict__') and not isinstance(obj, type):
+            return sum(self._estimate_object_size(item, seen, depth + 1) for item in vars(obj).values())
+        return 0
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get size and hit/miss/eviction counters of the cluster cache.
+
+        Returns:
+            Dictionary of BoundedCache statistics
         """
-        return self.cluster_results.get(search_id, {})
+        return self.cluster_cache.stats()
 
 
 # Global clustering service instance
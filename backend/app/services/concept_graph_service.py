@@ -7,12 +7,33 @@ Builds a hierarchical concept graph from article texts by:
 3. Continuing until reaching a single root concept (Cluster Theme)
 
 Adapted for Hacker News technical articles with HN-specific prompts.
+Article concepts are extracted concurrently on a bounded thread pool, several
+articles per prompt, with a per-article call for any article a batch misses.
+Extracted concepts are persisted per article, so only unseen articles reach the LLM.
+Near-duplicate Layer 1 concepts are merged by embedding similarity.
+Higher layers are built either by LLM aggregation and mapping calls, or by
+agglomerative clustering of concept embeddings with one LLM call per layer
+to name the groups.
 """
 
-from typing import List, Dict, Optional, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass, field
+import numpy as np
+from app.config import settings
 from app.models import Story
 from app.services import llm_client
+from app.services.concept_store import ConceptKey, ConceptStore, content_hash
+from app.services.embedding_service import embedding_service
+
+# Bump when the extraction prompts change so stored concepts are extracted again
+CONCEPT_PROMPT_VERSION = "1"
+ARTICLE_TEXT_CHARS = 1500  # Article text sent per article (~375 tokens)
+CHARS_PER_TOKEN = 4  # Rough token estimate for English text
+
+# How layers above Layer 1 are built: LLM aggregate + map calls, or embedding clustering
+LAYER_MODES = ('llm', 'embedding')
 
 
 @dataclass
@@ -35,27 +56,45 @@ class ConceptGraphService:
     def __init__(self):
         """Initialize the concept graph service."""
         self.client = llm_client.get_client()
-        # Cache for concept graphs: key = "search_id:cluster_id"
+        # Cache for concept graphs: key = "search_id:cluster_id:member_hash"
         self.concept_cache = {}
+        # Shared by all requests so the number of concurrent LLM calls stays bounded
+        self.extraction_pool = ThreadPoolExecutor(
+            max_workers=max(1, settings.CONCEPT_EXTRACTION_CONCURRENCY),
+            thread_name_prefix="concept-extraction"
+        )
+        # Concepts per article, shared across searches and clusters
+        self.concept_store: Optional[ConceptStore] = None
+        if settings.CONCEPT_STORE_ENABLED:
+            self.concept_store = ConceptStore(
+                path=settings.resolve_path(settings.CONCEPT_STORE_PATH),
+                max_entries=settings.CONCEPT_STORE_MAX_ENTRIES
+            )
+
+    def close(self):
+        """Close the concept store and stop the extraction pool."""
+        self.extraction_pool.shutdown(wait=False, cancel_futures=True)
+        if self.concept_store is not None:
+            self.concept_store.close()
     
-    def _get_cache_key(self, search_id: str, cluster_id: int) -> str:
-        """Generate cache key for concept graph."""
-        return f"{search_id}:{cluster_id}"
+    def _get_cache_key(self, search_id: str, cluster_id: int, stories: List[Story]) -> str:
+        """Generate cache key for concept graph (reclustering changes the member stories)."""
+        members = content_hash(",".join(sorted(story.id for story in stories)))[:12]
+        return f"{search_id}:{cluster_id}:{members}"
     
-    def extract_article_concepts(
-        self, 
-        article_text: str, 
-        article_title: str
-    ) -> List[str]:
+    def _request_article_concepts(self, article_text: str, article_title: str) -> List[str]:
         """
-        Extract 2-4 high-level technical concepts from an article using LLM.
-        
+        Ask the LLM for 2-4 high-level technical concepts of one article.
+
         Args:
             article_text: Article content (or title if content unavailable)
             article_title: Article title
-            
+
         Returns:
             List of 2-4 concept strings
+
+        Raises:
+            Exception: If the LLM call fails
         """
         system_prompt = """You are an expert at analyzing Hacker News technical discussions.
 Extract 2-4 core technical themes from the article, focusing on:
@@ -71,38 +110,202 @@ Each concept should be a short phrase (2-5 words) that captures a key technical
 Title: {article_title}
 
 Content:
-{article_text[:1500]}  # Limit to ~1000 tokens
+{article_text[:ARTICLE_TEXT_CHARS]}
 
 Return ONLY a JSON array of concept strings. Example format:
 ["concept one", "concept two", "concept three"]
 
 If you cannot identify meaningful concepts, return an empty array []."""
 
+        response_text = llm_client.call_llm(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.5,  # Lower temperature for more focused extraction
+            max_tokens=200,
+            client=self.client
+        )
+
+        # Parse JSON response
+        concepts = llm_client.parse_json_response(
+            response_text,
+            fallback_parser=llm_client.parse_list_response
+        )
+
+        if isinstance(concepts, list):
+            return [str(c).lower().strip() for c in concepts[:4] if c]
+
+        return llm_client.parse_list_response(response_text)[:4]
+
+    def extract_article_concepts(
+        self,
+        article_text: str,
+        article_title: str
+    ) -> List[str]:
+        """
+        Extract 2-4 high-level technical concepts from an article using LLM.
+
+        Args:
+            article_text: Article content (or title if content unavailable)
+            article_title: Article title
+
+        Returns:
+            List of 2-4 concept strings (the title if the LLM call fails)
+        """
+        try:
+            return self._request_article_concepts(article_text, article_title)
+        except Exception as e:
+            print(f"Error extracting concepts for article '{article_title}': {e}")
+            # Fallback: use article title as single concept
+            return [article_title.lower()[:50]]
+    
+    def _article_text(self, story: Story) -> str:
+        """Use content if available, otherwise use title."""
+        return story.content if story.content and story.content_fetch_success else story.title
+
+    def _batch_stories(self, stories: List[Story]) -> List[List[Story]]:
+        """
+        Pack stories into extraction batches bounded by article count and token budget.
+
+        Args:
+            stories: List of Story objects
+
+        Returns:
+            Consecutive batches of stories
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for story in stories:
+            tokens = (len(story.title) + len(self._article_text(story)[:ARTICLE_TEXT_CHARS])) // CHARS_PER_TOKEN
+            if batch and (len(batch) >= settings.CONCEPT_EXTRACTION_BATCH_SIZE
+                          or batch_tokens + tokens > settings.CONCEPT_EXTRACTION_BATCH_TOKENS):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(story)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def extract_batch_concepts(self, stories: List[Story]) -> Dict[str, List[str]]:
+        """
+        Extract 2-4 technical concepts from each of several articles with one LLM call.
+
+        Args:
+            stories: Batch of Story objects
+
+        Returns:
+            Dictionary mapping story ID to concept list; articles missing from the
+            response (or all of them, if the call fails) are left out
+        """
+        system_prompt = """You are an expert at analyzing Hacker News technical discussions.
+For each article, extract 2-4 core technical themes, focusing on:
+- Technologies, frameworks, or tools mentioned
+- Engineering problems or challenges addressed
+- Innovative approaches or solutions
+- Industry trends or developments
+
+Each concept should be a short phrase (2-5 words) that captures a key technical theme."""
+
+        articles = "\n\n".join(
+            f"""Article ID: {story.id}
+Title: {story.title}
+Content:
+{self._article_text(story)[:ARTICLE_TEXT_CHARS]}"""
+            for story in stories
+        )
+        user_prompt = f"""Analyze these {len(stories)} Hacker News articles and extract 2-4 technical concepts from each:
+
+{articles}
+
+Return ONLY a JSON object mapping every article ID to an array of concept strings. Example format:
+{{"123": ["concept one", "concept two"], "456": ["concept three", "concept four"]}}
+
+If you cannot identify meaningful concepts for an article, map it to an empty array []."""
+
         try:
             response_text = llm_client.call_llm(
                 prompt=user_prompt,
                 system_prompt=system_prompt,
                 temperature=0.5,  # Lower temperature for more focused extraction
-                max_tokens=200,
+                max_tokens=60 * len(stories) + 50,
                 client=self.client
             )
-            
-            # Parse JSON response
-            concepts = llm_client.parse_json_response(
-                response_text,
-                fallback_parser=llm_client.parse_list_response
-            )
-            
-            if isinstance(concepts, list):
-                return [str(c).lower().strip() for c in concepts[:4] if c]
-            
-            return llm_client.parse_list_response(response_text)[:4]
-        
+
+            parsed = llm_client.parse_json_response(response_text)
+            if not isinstance(parsed, dict):
+                return {}
+
+            story_ids = {story.id for story in stories}
+            return {
+                str(story_id): [str(c).lower().strip() for c in concepts[:4] if c]
+                for story_id, concepts in parsed.items()
+                if str(story_id) in story_ids and isinstance(concepts, list)
+            }
+
         except Exception as e:
-            print(f"Error extracting concepts for article '{article_title}': {e}")
-            # Fallback: use article title as single concept
-            return [article_title.lower()[:50]]
-    
+            print(f"Error extracting concepts for a batch of {len(stories)} articles: {e}")
+            return {}
+
+    def _concept_key(self, story: Story) -> ConceptKey:
+        """Concept store key: story ID, hash of the text the prompt uses and prompt version."""
+        text = f"{story.title}\n{self._article_text(story)[:ARTICLE_TEXT_CHARS]}"
+        return story.id, content_hash(text), CONCEPT_PROMPT_VERSION
+
+    def extract_all_concepts(self, stories: List[Story]) -> List[List[str]]:
+        """
+        Extract concepts from many articles concurrently.
+
+        Articles already in the concept store are not sent to the LLM. The rest
+        are packed into batched prompts (CONCEPT_EXTRACTION_BATCH_SIZE); any
+        article missing from a batch response gets its own call.
+
+        Args:
+            stories: List of Story objects
+
+        Returns:
+            Concept lists in the same order as stories (independent of completion order)
+        """
+        keys = {story.id: self._concept_key(story) for story in stories}
+        concepts_by_id: Dict[str, List[str]] = {}
+        if self.concept_store is not None:
+            stored = self.concept_store.get_many(keys.values())
+            concepts_by_id = {story_id: stored[key] for story_id, key in keys.items() if key in stored}
+            print(f"  → {len(concepts_by_id)} of {len(keys)} articles found in the concept store")
+
+        # Only successful extractions are stored; failed calls fall back to the title
+        extracted: Dict[str, List[str]] = {}
+        pending = list({story.id: story for story in stories if story.id not in concepts_by_id}.values())
+        if pending and settings.CONCEPT_EXTRACTION_BATCH_SIZE > 1:
+            batches = self._batch_stories(pending)
+            for batch_concepts in self.extraction_pool.map(self.extract_batch_concepts, batches):
+                extracted.update(batch_concepts)
+
+        missing = [story for story in pending if story.id not in extracted]
+        if missing and settings.CONCEPT_EXTRACTION_BATCH_SIZE > 1:
+            print(f"  → Falling back to per-article extraction for {len(missing)} articles")
+
+        def extract(story: Story) -> Optional[List[str]]:
+            try:
+                return self._request_article_concepts(self._article_text(story), story.title)
+            except Exception as e:
+                print(f"Error extracting concepts for article '{story.title}': {e}")
+                return None
+
+        for story, concepts in zip(missing, self.extraction_pool.map(extract, missing)):
+            if concepts is not None:
+                extracted[story.id] = concepts
+            else:
+                # Fallback: use article title as single concept
+                concepts_by_id[story.id] = [story.title.lower()[:50]]
+
+        if self.concept_store is not None:
+            self.concept_store.put_many({keys[story_id]: concepts for story_id, concepts in extracted.items()})
+        concepts_by_id.update(extracted)
+
+        return [concepts_by_id[story.id] for story in stories]
+
     def aggregate_concepts(self, concepts: List[str]) -> List[str]:
         """
         Aggregate multiple concepts into fewer, broader themes using LLM.
@@ -229,6 +432,162 @@ Each concept should map to exactly one broader category."""
                 result[broader_concepts[i % len(broader_concepts)]].append(i)
             return result
     
+    def dedupe_concepts(self, concepts: List[str]) -> Dict[str, str]:
+        """
+        Map near-duplicate concept labels (e.g. "rust memory safety" and
+        "memory safety in rust") onto one canonical label.
+
+        Labels are embedded in one batch. In first-seen order, each label not yet
+        merged absorbs every later unmerged label whose cosine similarity to it
+        reaches CONCEPT_DEDUP_THRESHOLD; comparing with the canonical label only
+        keeps chains of loosely related labels from collapsing.
+
+        Args:
+            concepts: Concept labels in extraction order (may repeat)
+
+        Returns:
+            Dictionary mapping every label to its canonical label
+        """
+        unique = list(dict.fromkeys(concept for concept in concepts if concept))
+        if len(unique) < 2:
+            return {concept: concept for concept in unique}
+
+        try:
+            vectors = embedding_service.encode_texts(unique)
+        except Exception as e:
+            print(f"Error embedding concepts for deduplication: {e}")
+            return {concept: concept for concept in unique}
+
+        similar = (vectors @ vectors.T) >= settings.CONCEPT_DEDUP_THRESHOLD
+        canonical = np.full(len(unique), -1, dtype=np.int64)
+        for i in range(len(unique)):
+            if canonical[i] < 0:
+                canonical[similar[i] & (canonical < 0)] = i
+
+        merged = len(unique) - len(np.unique(canonical))
+        if merged:
+            print(f"  → Merged {merged} near-duplicate concepts into existing ones")
+        return {concept: unique[canonical[i]] for i, concept in enumerate(unique)}
+
+    def group_concepts(self, vectors: np.ndarray) -> Tuple[List[List[int]], np.ndarray]:
+        """
+        Group concept embeddings into roughly half as many groups with agglomerative clustering.
+
+        Args:
+            vectors: Unit-norm concept embeddings (n_concepts, dim)
+
+        Returns:
+            Tuple of (child indices per group, ordered by first member; unit-norm
+            group centroids for the next layer)
+        """
+        from sklearn.cluster import AgglomerativeClustering
+
+        n_groups = max(1, len(vectors) // 2)
+        if n_groups == 1:
+            labels = np.zeros(len(vectors), dtype=np.int64)
+        else:
+            labels = AgglomerativeClustering(
+                n_clusters=n_groups,
+                metric='cosine',
+                linkage='average'
+            ).fit_predict(vectors)
+
+        # Number groups by their first member so the layer doesn't depend on sklearn's label order
+        _, first_members, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.argsort(np.argsort(first_members))
+        labels = rank[inverse]
+        groups = [np.flatnonzero(labels == group).tolist() for group in range(len(first_members))]
+
+        centroids = np.zeros((len(groups), vectors.shape[1]), dtype=np.float32)
+        np.add.at(centroids, labels, vectors)
+        centroids /= np.clip(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12, None)
+        return groups, centroids
+
+    def name_concept_groups(
+        self,
+        concepts: List[str],
+        groups: List[List[int]],
+        vectors: np.ndarray,
+        centroids: np.ndarray
+    ) -> List[str]:
+        """
+        Name concept groups with a single LLM call.
+
+        Singleton groups keep their concept's name. If the call fails or returns
+        the wrong number of names, a group is named after its member closest to
+        the group centroid.
+
+        Args:
+            concepts: Concept labels of the current layer
+            groups: Child indices per group from group_concepts
+            vectors: Unit-norm concept embeddings
+            centroids: Unit-norm group centroids
+
+        Returns:
+            One name per group
+        """
+        names = []
+        for group, centroid in zip(groups, centroids):
+            members = np.asarray(group)
+            names.append(concepts[members[np.argmax(vectors[members] @ centroid)]])
+
+        to_name = [i for i, group in enumerate(groups) if len(group) > 1]
+        if not to_name:
+            return names
+
+        system_prompt = """You are an expert at categorizing and synthesizing Hacker News technical discussions.
+Name groups of related technical concepts with broader technical themes."""
+
+        group_lines = "\n".join(
+            f"{n + 1}. {'; '.join(concepts[i] for i in groups[g])}" for n, g in enumerate(to_name)
+        )
+        user_prompt = f"""Each numbered line below is a group of related technical concepts from Hacker News articles.
+Name each of the {len(to_name)} groups with a broader technical theme.
+
+Groups:
+{group_lines}
+
+Each theme should be a short phrase (2-6 words) that represents a category of concepts.
+Focus on technical domains, problem areas, or technology categories.
+
+Return ONLY a JSON array of {len(to_name)} theme strings, one per group, in the same order. Example format:
+["broader theme one", "broader theme two"]"""
+
+        try:
+            response_text = llm_client.call_llm(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.5,
+                max_tokens=20 * len(to_name) + 50,
+                client=self.client
+            )
+
+            themes = llm_client.parse_json_response(
+                response_text,
+                fallback_parser=llm_client.parse_list_response
+            )
+            if not isinstance(themes, list) or len(themes) != len(to_name):
+                print(f"Expected {len(to_name)} group names, got a different response; using central concepts")
+                return names
+
+            for g, theme in zip(to_name, themes):
+                if str(theme).strip():
+                    names[g] = str(theme).lower().strip()
+            return names
+
+        except Exception as e:
+            print(f"Error naming concept groups: {e}")
+            return names
+
+    def _unique_node_id(self, nodes: Dict[str, "ConceptNode"], concept_id: str) -> str:
+        """Suffix a node ID already in use so nodes with the same name stay separate."""
+        unique_id = concept_id
+        suffix = 2
+        while unique_id in nodes:
+            unique_id = f"{concept_id}_{suffix}"
+            suffix += 1
+        return unique_id
+
     def generate_root_concept(self, concepts: List[str]) -> str:
         """
         Generate a single root concept from final layer concepts.
@@ -287,7 +646,7 @@ Do not include quotes or any other text."""
             Dictionary with 'nodes' list and 'root_id' string
         """
         # Check cache
-        cache_key = self._get_cache_key(search_id, cluster_id)
+        cache_key = self._get_cache_key(search_id, cluster_id, stories)
         if cache_key in self.concept_cache:
             print(f"Returning cached concept graph for cluster {cluster_id}")
             return self.concept_cache[cache_key]
@@ -320,18 +679,24 @@ Do not include quotes or any other text."""
         print(f"[Step 1] Extracting concepts from {len(stories)} articles...")
         article_concepts = {}  # article_id -> list of concept_ids
         concept_label_to_id = {}  # concept_label -> concept_id (for deduplication)
-        
-        for story in stories:
-            # Use content if available, otherwise use title
-            article_text = story.content if story.content and story.content_fetch_success else story.title
-            
-            concepts = self.extract_article_concepts(article_text, story.title)
-            
+
+        start = time.perf_counter()
+        extracted = self.extract_all_concepts(stories)
+        print(f"  → Extraction took {time.perf_counter() - start:.1f}s "
+              f"({settings.CONCEPT_EXTRACTION_CONCURRENCY} concurrent calls)")
+
+        # Near-duplicates map to the label seen first, which is the one that gets a node
+        canonical = {}
+        if settings.CONCEPT_DEDUP_ENABLED:
+            canonical = self.dedupe_concepts([c.lower().strip() for concepts in extracted for c in concepts])
+
+        # Merge in story order so node IDs and parents don't depend on which call finished first
+        for story, concepts in zip(stories, extracted):
             # Create concept nodes for this article
             story_concept_ids = []
             for concept in concepts:
                 # Normalize concept for ID generation (lowercase, replace spaces/slashes)
-                concept_normalized = concept.lower().strip()
+                concept_normalized = canonical.get(concept.lower().strip(), concept.lower().strip())
                 
                 # Check if this concept already exists
                 if concept_normalized in concept_label_to_id:
@@ -343,7 +708,9 @@ Do not include quotes or any other text."""
                         nodes[concept_id].children.append(article_node_id)
                         nodes[article_node_id].parent = concept_id
                     
-                    story_concept_ids.append(concept_id)
+                    # Two concepts of one article can merge into the same node
+                    if concept_id not in story_concept_ids:
+                        story_concept_ids.append(concept_id)
                 else:
                     # Create new concept node
                     concept_id = f"L1_{concept.replace(' ', '_').replace('/', '_')[:50]}"
@@ -373,34 +740,55 @@ Do not include quotes or any other text."""
             return {"nodes": [], "root_id": None, "layer_count": 0}
         
         # Step 2: Recursive aggregation
-        print("[Step 2] Aggregating concepts into higher layers...")
+        layer_mode = settings.CONCEPT_LAYER_MODE
+        if layer_mode not in LAYER_MODES:
+            raise ValueError(f"Unknown concept layer mode '{layer_mode}' (expected one of {', '.join(LAYER_MODES)})")
+        print(f"[Step 2] Aggregating concepts into higher layers ({layer_mode})...")
         current_layer = 1
         current_concept_ids = all_layer1_concepts
-        
+
+        # Embedding mode embeds the Layer 1 labels once; higher layers use group centroids
+        current_vectors = None
+        if layer_mode == 'embedding' and len(current_concept_ids) > 1:
+            try:
+                current_vectors = embedding_service.encode_texts([nodes[cid].label for cid in current_concept_ids])
+            except Exception as e:
+                print(f"Error embedding concepts, falling back to llm layers: {e}")
+                layer_mode = 'llm'
+
         while len(current_concept_ids) > 1:
             current_layer += 1
             current_concepts = [nodes[cid].label for cid in current_concept_ids]
             
             print(f"  Layer {current_layer}: Aggregating {len(current_concepts)} concepts...")
-            
-            # Aggregate to broader concepts
-            broader_concepts = self.aggregate_concepts(current_concepts)
-            print(f"    → Generated {len(broader_concepts)} broader concepts")
-            
-            # If no reduction, force it or break
-            if len(broader_concepts) >= len(current_concepts):
-                if len(current_concepts) <= 2:
-                    break
-                broader_concepts = broader_concepts[:max(1, len(current_concepts)//2)]
-            
-            # Map concepts to broader categories
-            mapping = self.map_concepts_to_broader(current_concepts, broader_concepts)
-            
+
+            if layer_mode == 'embedding':
+                # Group locally, then name all groups with one LLM call
+                groups, centroids = self.group_concepts(current_vectors)
+                broader_concepts = self.name_concept_groups(current_concepts, groups, current_vectors, centroids)
+                current_vectors = centroids
+                print(f"    → Grouped into {len(broader_concepts)} broader concepts")
+            else:
+                # Aggregate to broader concepts
+                broader_concepts = self.aggregate_concepts(current_concepts)
+                print(f"    → Generated {len(broader_concepts)} broader concepts")
+
+                # If no reduction, force it or break
+                if len(broader_concepts) >= len(current_concepts):
+                    if len(current_concepts) <= 2:
+                        break
+                    broader_concepts = broader_concepts[:max(1, len(current_concepts)//2)]
+
+                # Map concepts to broader categories
+                mapping = self.map_concepts_to_broader(current_concepts, broader_concepts)
+                groups = [mapping.get(broader, []) for broader in broader_concepts]
+
             # Create new layer nodes
             new_concept_ids = []
-            for broader in broader_concepts:
-                concept_id = f"L{current_layer}_{broader.replace(' ', '_').replace('/', '_')[:30]}"
-                child_indices = mapping.get(broader, [])
+            for broader, child_indices in zip(broader_concepts, groups):
+                concept_id = self._unique_node_id(
+                    nodes, f"L{current_layer}_{broader.replace(' ', '_').replace('/', '_')[:30]}"
+                )
                 child_ids = [current_concept_ids[i] for i in child_indices if i < len(current_concept_ids)]
                 
                 nodes[concept_id] = ConceptNode(
@@ -0,0 +1,144 @@
+"""
+Concept Store
+
+SQLite-backed store of the concepts extracted from each article, keyed by
+story ID, a hash of the article text sent to the LLM and the extraction
+prompt version. The same story reappearing in another search or another
+cluster reuses its concepts instead of calling the LLM again; an edited
+article or a changed prompt gets a new key.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ConceptKey = Tuple[str, str, str]  # (story_id, content_hash, prompt_version)
+
+
+def content_hash(text: str) -> str:
+    """
+    Hash the article text an extraction prompt is built from.
+
+    Args:
+        text: Article title and text as sent to the LLM
+
+    Returns:
+        Hex digest string
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ConceptStore:
+    """SQLite-backed per-article concept store with LRU eviction by entry count."""
+
+    def __init__(self, path: str, max_entries: int):
+        """
+        Initialize the concept store. The database is opened on first use.
+
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Maximum number of stored articles
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS concepts (
+                    story_id TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    concepts TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (story_id, content_hash, prompt_version)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_concepts_accessed ON concepts (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: Iterable[ConceptKey]) -> Dict[ConceptKey, List[str]]:
+        """
+        Look up the concepts of several articles.
+
+        Args:
+            keys: (story_id, content_hash, prompt_version) tuples
+
+        Returns:
+            Dictionary mapping each found key to its concept list
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for key in keys:
+                row = conn.execute(
+                    "SELECT concepts FROM concepts WHERE story_id = ? AND content_hash = ? AND prompt_version = ?",
+                    key
+                ).fetchone()
+                if row is not None:
+                    found[key] = json.loads(row[0])
+            if found:
+                conn.executemany(
+                    "UPDATE concepts SET accessed_at = ? WHERE story_id = ? AND content_hash = ? AND prompt_version = ?",
+                    [(now, *key) for key in found]
+                )
+                conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[ConceptKey, List[str]]):
+        """
+        Store the concepts of several articles and evict entries over the budget.
+
+        Args:
+            entries: Dictionary mapping (story_id, content_hash, prompt_version) to concepts
+        """
+        if not entries:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO concepts VALUES (?, ?, ?, ?, ?, ?)",
+                [(*key, json.dumps(concepts), now, now) for key, concepts in entries.items()]
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop the least recently used entries over max_entries."""
+        count = conn.execute("SELECT COUNT(*) FROM concepts").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM concepts WHERE rowid IN (SELECT rowid FROM concepts ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,224 @@
+"""
+Content Cache
+
+Disk-backed cache of extracted article content keyed by normalized URL.
+Entries keep the ETag / Last-Modified validators of the response so stale
+entries can be revalidated with a conditional request instead of being
+downloaded and parsed again.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent links share one cache entry.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query parameters.
+
+    Args:
+        url: Raw URL
+
+    Returns:
+        Normalized URL string
+    """
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    netloc = host
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{host}:{port}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path or "/"
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+class ContentCache:
+    """SQLite-backed cache of extracted article content with TTL and size eviction."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_age_seconds: float, max_bytes: int):
+        """
+        Initialize the content cache. The database is opened on first use.
+
+        Args:
+            path: Path of the SQLite database file
+            ttl_seconds: Age after which an entry must be revalidated
+            max_age_seconds: Age after which an entry is evicted
+            max_bytes: Maximum total size of cached content
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS content (
+                    url_key TEXT PRIMARY KEY,
+                    title TEXT,
+                    content TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_content_accessed ON content (accessed_at)")
+            conn.commit()
+            self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM content").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached content for a URL.
+
+        Args:
+            url: Article URL
+
+        Returns:
+            Entry dict with a 'fresh' flag (False means revalidate first), or None
+        """
+        url_key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT title, content, etag, last_modified, fetched_at FROM content WHERE url_key = ?",
+                (url_key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            title, content, etag, last_modified, fetched_at = row
+            age = now - fetched_at
+            if age > self.max_age_seconds:
+                self._delete(conn, url_key)
+                conn.commit()
+                return None
+
+            conn.execute("UPDATE content SET accessed_at = ? WHERE url_key = ?", (now, url_key))
+            conn.commit()
+
+        return {
+            "title": title,
+            "content": content,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": age <= self.ttl_seconds
+        }
+
+    def put(
+        self,
+        url: str,
+        title: Optional[str],
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """
+        Store extracted content for a URL and evict entries over the size budget.
+
+        Args:
+            url: Article URL
+            title: Extracted title
+            content: Extracted text content
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        url_key = normalize_url(url)
+        now = time.time()
+        size = len(content.encode("utf-8")) + len(title or "")
+        with self._lock:
+            conn = self._connect()
+            self._delete(conn, url_key)
+            conn.execute(
+                "INSERT INTO content VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url_key, title, content, etag, last_modified, now, now, size)
+            )
+            self._total_bytes += size
+            self._evict(conn)
+            conn.commit()
+
+    def touch(self, url: str):
+        """
+        Mark an entry as freshly validated (after a 304 Not Modified).
+
+        Args:
+            url: Article URL
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE content SET fetched_at = ?, accessed_at = ? WHERE url_key = ?",
+                (now, now, normalize_url(url))
+            )
+            conn.commit()
+
+    def _delete(self, conn: sqlite3.Connection, url_key: str):
+        """Delete a single entry and update the size counter."""
+        row = conn.execute("SELECT size FROM content WHERE url_key = ?", (url_key,)).fetchone()
+        if row:
+            conn.execute("DELETE FROM content WHERE url_key = ?", (url_key,))
+            self._total_bytes -= row[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop entries past max age, then least recently used entries over the size budget."""
+        cutoff = time.time() - self.max_age_seconds
+        expired = conn.execute("SELECT COALESCE(SUM(size), 0) FROM content WHERE fetched_at < ?", (cutoff,)).fetchone()[0]
+        if expired:
+            conn.execute("DELETE FROM content WHERE fetched_at < ?", (cutoff,))
+            self._total_bytes -= expired
+
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        freed = 0
+        victims = []
+        for url_key, size in conn.execute("SELECT url_key, size FROM content ORDER BY accessed_at"):
+            if self._total_bytes - freed <= self.max_bytes:
+                break
+            victims.append((url_key,))
+            freed += size
+        conn.executemany("DELETE FROM content WHERE url_key = ?", victims)
+        self._total_bytes -= freed
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,29 +1,118 @@
-from sentence_transformers import SentenceTransformer
+import asyncio
+import threading
+import time
 import numpy as np
-from typing import List, Dict
-import torch
-from cachetools import LRUCache
+from typing import Any, List, Dict, Optional, Tuple
 from app.config import settings
 from app.models import Story
+from app.services.embedding_store import EmbeddingStore
+from app.services.embedding_worker import EmbeddingWorker
+from app.services.singleflight import SingleFlight
+
+# What each story contributes to its embedding
+EMBEDDING_MODES = ('title', 'content')
 
 
 class EmbeddingService:
     """Service for generating embeddings using sentence-transformers."""
 
     def __init__(self):
-        """Initialize embedding model and cache."""
+        """Initialize caches. The model is loaded on first use (or by warmup at startup)."""
+        self.backend = settings.EMBEDDING_BACKEND
+        self.model_name = settings.EMBEDDING_MODEL_NAME
+        self.device = 'cpu'
+        self._model = None
+        self._model_lock = threading.Lock()
+
+        # Per-text embedding cache (memory LRU + memory-mapped disk tier).
+        # Quantized ONNX vectors differ slightly from torch ones, so they get their own keys.
+        store_model_name = self.model_name
+        if self.backend == 'onnx':
+            store_model_name += ':onnx-int8' if settings.EMBEDDING_ONNX_QUANTIZED else ':onnx-fp32'
+        self.embedding_cache = EmbeddingStore(
+            model_name=store_model_name,
+            memory_size=settings.CACHE_SIZE,
+            directory=settings.resolve_path(settings.EMBEDDING_STORE_DIR) if settings.EMBEDDING_STORE_DIR else None
+        )
+
+        # Storage for search embeddings and the mode they were generated with
+        self.search_embeddings: Dict[str, np.ndarray] = {}
+        self.search_embedding_modes: Dict[str, str] = {}
+
+        # Untruncated tokenizer copy for chunking and batch metrics (created on first use)
+        self._tokenizer = None
+        self._stats_lock = threading.Lock()
+        self._batch_stats = {'batches': 0, 'texts': 0, 'tokens': 0, 'padded_tokens': 0, 'seconds': 0.0,
+                             'measured_batches': 0, 'measured_seconds': 0.0}
+        self._chunk_stats = {'stories': 0, 'chunked_stories': 0, 'chunks': 0}
+
+        # Inference thread shared by all requests, plus per-search deduplication
+        self.worker = EmbeddingWorker(self._encode, batch_size=settings.EMBEDDING_BATCH_SIZE)
+        self.inflight = SingleFlight()
+
+    @property
+    def model(self) -> Any:
+        """The inference model, loaded on first access."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the model has been loaded."""
+        return self._model is not None
+
+    def import_backend(self):
+        """Import the inference libraries of the selected backend (torch and sentence-transformers, or onnxruntime)."""
+        if self.backend == 'onnx':
+            import onnxruntime  # noqa: F401
+            import tokenizers  # noqa: F401
+        else:
+            import torch  # noqa: F401
+            import sentence_transformers  # noqa: F401
+
+    def warmup(self):
+        """
+        Load the model and encode a dummy batch on the embedding worker so the
+        first real request doesn't pay for lazy initialization.
+        Blocks until done, so call it from a thread rather than the event loop.
+        """
+        texts = [f"Warmup sentence number {i} about software" for i in range(settings.EMBEDDING_BATCH_SIZE)]
+        self.worker.submit(texts).result()
+
+    def _load_model(self) -> Any:
+        """
+        Load the inference backend selected by EMBEDDING_BACKEND.
+
+        Returns:
+            SentenceTransformer (torch) or OnnxSentenceEncoder (onnx)
+        """
+        if self.backend == 'onnx':
+            from app.services.onnx_encoder import OnnxSentenceEncoder
+
+            precision = 'int8' if settings.EMBEDDING_ONNX_QUANTIZED else 'fp32'
+            onnx_dir = settings.resolve_path(settings.EMBEDDING_ONNX_DIR)
+            print(f"Embedding service using ONNX Runtime ({precision}) from {onnx_dir}")
+            return OnnxSentenceEncoder(
+                onnx_dir,
+                quantized=settings.EMBEDDING_ONNX_QUANTIZED,
+                num_threads=settings.EMBEDDING_ONNX_THREADS
+            )
+
+        if self.backend != 'torch':
+            raise ValueError(f"Unknown EMBEDDING_BACKEND '{self.backend}' (expected 'torch' or 'onnx')")
+
+        import torch
+        from sentence_transformers import SentenceTransformer
+
         # Determine device (GPU if available, otherwise CPU)
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
         print(f"Embedding service using device: {self.device}")
 
         # Load sentence-transformers model
-        self.model = SentenceTransformer('all-MiniLM-L6-v2', device=self.device)
-
-        # Initialize cache for embeddings
-        self.embedding_cache: LRUCache = LRUCache(maxsize=settings.CACHE_SIZE)
-
-        # Storage for search embeddings
-        self.search_embeddings: Dict[str, np.ndarray] = {}
+        return SentenceTransformer(self.model_name, device=self.device)
 
     def preprocess_text(self, text: str) -> str:
         """
@@ -39,49 +128,318 @@ class EmbeddingService:
         text = ' '.join(text.split())
         return text
 
-    def generate_embeddings(self, stories: List[Story], search_id: str) -> np.ndarray:
+    def _get_tokenizer(self) -> Any:
         """
-        Generate embeddings for a list of stories.
+        Get a copy of the model's fast tokenizer with truncation and padding disabled.
+
+        Returns:
+            tokenizers.Tokenizer instance
+        """
+        if self._tokenizer is None:
+            from tokenizers import Tokenizer
+
+            # SentenceTransformer wraps a transformers tokenizer, the ONNX encoder holds a tokenizers.Tokenizer
+            source = getattr(self.model.tokenizer, 'backend_tokenizer', self.model.tokenizer)
+            tokenizer = Tokenizer.from_str(source.to_str())
+            tokenizer.no_truncation()
+            tokenizer.no_padding()
+            self._tokenizer = tokenizer
+        return self._tokenizer
+
+    def _encode(self, texts: List[str], lengths: List[Optional[int]]) -> np.ndarray:
+        """
+        Run the model on a micro-batch and record token/padding metrics.
+        Called on the embedding worker thread.
 
         Args:
-            stories: List of Story objects
-            search_id: Unique identifier for this search
+            texts: Preprocessed texts
+            lengths: Token count of each text including special tokens (None where unknown)
 
         Returns:
-            numpy array of shape (n_stories, 384) containing embeddings
+            Normalized embeddings of shape (len(texts), dim)
         """
-        if not stories:
-            return np.array([])
+        # Chunks arrive with their token counts. Other texts (titles) are only tokenized for
+        # the metrics when EMBEDDING_TOKEN_METRICS is on; otherwise the batch goes unmeasured
+        unknown = [i for i, length in enumerate(lengths) if length is None]
+        if unknown and settings.EMBEDDING_TOKEN_METRICS:
+            lengths = list(lengths)
+            encodings = self._get_tokenizer().encode_batch([texts[i] for i in unknown])
+            for i, encoding in zip(unknown, encodings):
+                lengths[i] = len(encoding.ids)
+        measured = not unknown or settings.EMBEDDING_TOKEN_METRICS
+        if measured:
+            # Each micro-batch is at most one model batch, padded to its longest text
+            max_seq_length = self.model.max_seq_length
+            lengths = [min(length, max_seq_length) for length in lengths]
 
-        # Check if embeddings already exist for this search
-        if search_id in self.search_embeddings:
-            print(f"Using cached embeddings for search_id: {search_id}")
-            return self.search_embeddings[search_id]
+        start = time.perf_counter()
+        embeddings = self.model.encode(
+            texts,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True  # Normalize for better clustering
+        )
+        elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            self._batch_stats['batches'] += 1
+            self._batch_stats['texts'] += len(texts)
+            self._batch_stats['seconds'] += elapsed
+            if measured:
+                self._batch_stats['measured_batches'] += 1
+                self._batch_stats['measured_seconds'] += elapsed
+                self._batch_stats['tokens'] += sum(lengths)
+                self._batch_stats['padded_tokens'] += len(lengths) * max(lengths, default=0)
+        return embeddings
 
-        # Preprocess story texts (use title if available, otherwise text)
+    def _story_texts(self, stories: List[Story]) -> List[str]:
+        """Preprocess story texts (use title if available, otherwise text)."""
         story_texts = []
         for story in stories:
             if hasattr(story, 'title') and story.title:
                 story_texts.append(self.preprocess_text(story.title))
             else:
                 story_texts.append(self.preprocess_text(story.text))
+        return story_texts
 
-        # Generate embeddings in batches
-        print(f"Generating embeddings for {len(story_texts)} stories...")
-        embeddings = self.model.encode(
-            story_texts,
-            batch_size=settings.EMBEDDING_BATCH_SIZE,
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            normalize_embeddings=True  # Normalize for better clustering
+    def _chunk_stories(self, stories: List[Story]) -> Tuple[List[str], np.ndarray, List[int]]:
+        """
+        Split story content into chunks that fit the model's token window.
+
+        Stories without fetched content fall back to their title. Chunks are
+        returned sorted by token count so micro-batches hold similar lengths
+        and waste little compute on padding.
+
+        Args:
+            stories: List of Story objects
+
+        Returns:
+            Tuple of (chunk texts, index of the owning story for each chunk,
+            token count of each chunk including special tokens)
+        """
+        tokenizer = self._get_tokenizer()
+        special_tokens = tokenizer.num_special_tokens_to_add(False)
+        window = self.model.max_seq_length - special_tokens
+        size = min(settings.EMBEDDING_CHUNK_TOKENS or window, window)
+        step = max(1, size - settings.EMBEDDING_CHUNK_OVERLAP)
+
+        texts = []
+        for story, title in zip(stories, self._story_texts(stories)):
+            if story.content:
+                texts.append(self.preprocess_text(f"{title}. {story.content}"))
+            else:
+                texts.append(title)
+
+        chunks: List[Tuple[int, str, int]] = []  # (token count, text, story index)
+        chunked_stories = 0
+        for index, (text, encoding) in enumerate(zip(texts, tokenizer.encode_batch(texts, add_special_tokens=False))):
+            offsets = encoding.offsets
+            if len(offsets) <= size:
+                chunks.append((len(offsets), text, index))
+                continue
+
+            chunked_stories += 1
+            for n, start in enumerate(range(0, len(offsets), step)):
+                end = min(start + size, len(offsets))
+                chunks.append((end - start, text[offsets[start][0]:offsets[end - 1][1]], index))
+                if end == len(offsets) or n + 1 == settings.EMBEDDING_MAX_CHUNKS_PER_STORY:
+                    break
+
+        chunks.sort(key=lambda chunk: chunk[0])
+        with self._stats_lock:
+            self._chunk_stats['stories'] += len(stories)
+            self._chunk_stats['chunked_stories'] += chunked_stories
+            self._chunk_stats['chunks'] += len(chunks)
+        return (
+            [text for _, text, _ in chunks],
+            np.array([index for _, _, index in chunks]),
+            [count + special_tokens for count, _, _ in chunks]
         )
 
-        # Cache the embeddings
+    def _pool_chunks(self, chunk_embeddings: np.ndarray, owners: np.ndarray, n_stories: int) -> np.ndarray:
+        """
+        Mean-pool chunk embeddings per story and re-normalize.
+
+        Args:
+            chunk_embeddings: Array of shape (n_chunks, dim)
+            owners: Story index of each chunk
+            n_stories: Number of stories
+
+        Returns:
+            Normalized embeddings of shape (n_stories, dim)
+        """
+        pooled = np.zeros((n_stories, chunk_embeddings.shape[1]), dtype=np.float32)
+        np.add.at(pooled, owners, chunk_embeddings)
+        pooled /= np.bincount(owners, minlength=n_stories)[:, None]
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+    def _lookup(self, texts: List[str]) -> Tuple[List[str], List[Optional[np.ndarray]], Dict[str, str]]:
+        """
+        Look up per-text embeddings in the embedding store.
+
+        Returns:
+            Tuple of (keys, cached vectors or None, deduplicated missing key -> text)
+        """
+        keys = [self.embedding_cache.make_key(text) for text in texts]
+        cached = self.embedding_cache.get_many(keys)
+        missing = {}
+        for key, text, vector in zip(keys, texts, cached):
+            if vector is None:
+                missing[key] = text
+        return keys, cached, missing
+
+    def _merge(
+        self,
+        keys: List[str],
+        cached: List[Optional[np.ndarray]],
+        missing: Dict[str, str],
+        new_embeddings: np.ndarray
+    ) -> np.ndarray:
+        """Store newly encoded vectors and assemble the full embedding matrix."""
+        if missing:
+            self.embedding_cache.put_many(list(missing.keys()), new_embeddings)
+            encoded = dict(zip(missing.keys(), new_embeddings))
+            cached = [vector if vector is not None else encoded[key] for key, vector in zip(keys, cached)]
+        return np.stack(cached).astype(np.float32)
+
+    def _missing_lengths(
+        self,
+        texts: List[str],
+        lengths: Optional[List[int]],
+        missing: Dict[str, str]
+    ) -> Optional[List[Optional[int]]]:
+        """Token counts of the missing texts, if the caller passed counts for texts."""
+        if lengths is None:
+            return None
+        token_counts = dict(zip(texts, lengths))
+        return [token_counts.get(text) for text in missing.values()]
+
+    def encode_texts(self, texts: List[str], lengths: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Embed arbitrary texts through the embedding store and worker.
+        Blocks until done, so call it from a thread rather than the event loop.
+
+        Args:
+            texts: Texts to embed
+            lengths: Token count of each text including special tokens, if already known
+
+        Returns:
+            Normalized embeddings of shape (len(texts), dim)
+        """
+        texts = [self.preprocess_text(text) for text in texts]
+        keys, cached, missing = self._lookup(texts)
+        new_embeddings = None
+        if missing:
+            new_embeddings = self.worker.submit(list(missing.values()),
+                                                self._missing_lengths(texts, lengths, missing)).result()
+        return self._merge(keys, cached, missing, new_embeddings)
+
+    async def encode_texts_async(self, texts: List[str], lengths: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Embed arbitrary texts without blocking the event loop.
+
+        Args:
+            texts: Texts to embed
+            lengths: Token count of each text including special tokens, if already known
+
+        Returns:
+            Normalized embeddings of shape (len(texts), dim)
+        """
+        texts = [self.preprocess_text(text) for text in texts]
+        # The embedding store reads and appends its disk tier, so keep it off the event loop
+        keys, cached, missing = await asyncio.to_thread(self._lookup, texts)
+        new_embeddings = None
+        if missing:
+            new_embeddings = await self.worker.encode(list(missing.values()),
+                                                      self._missing_lengths(texts, lengths, missing))
+        return await asyncio.to_thread(self._merge, keys, cached, missing, new_embeddings)
+
+    def _get_cached_search(self, search_id: str, mode: str) -> Optional[np.ndarray]:
+        """Return stored embeddings for a search if they were generated with mode."""
+        if mode not in EMBEDDING_MODES:
+            raise ValueError(f"Unknown embedding mode '{mode}' (expected one of {', '.join(EMBEDDING_MODES)})")
+        if search_id in self.search_embeddings and self.search_embedding_modes.get(search_id) == mode:
+            print(f"Using cached embeddings for search_id: {search_id}")
+            return self.search_embeddings[search_id]
+        return None
+
+    def _store_search(self, search_id: str, mode: str, embeddings: np.ndarray):
+        """Store the embeddings of a search."""
         self.search_embeddings[search_id] = embeddings
+        self.search_embedding_modes[search_id] = mode
         print(f"Embeddings generated: shape {embeddings.shape}")
 
+    def generate_embeddings(self, stories: List[Story], search_id: str, mode: str = 'title') -> np.ndarray:
+        """
+        Generate embeddings for a list of stories.
+        Blocks until done; request handlers use generate_embeddings_async.
+
+        Args:
+            stories: List of Story objects
+            search_id: Unique identifier for this search
+            mode: 'title' embeds titles, 'content' mean-pools chunks of title + article content
+
+        Returns:
+            numpy array of shape (n_stories, 384) containing embeddings
+        """
+        if not stories:
+            return np.array([])
+
+        # Check if embeddings already exist for this search
+        cached = self._get_cached_search(search_id, mode)
+        if cached is not None:
+            return cached
+
+        print(f"Generating {mode} embeddings for {len(stories)} stories...")
+        if mode == 'content':
+            chunk_texts, owners, lengths = self._chunk_stories(stories)
+            embeddings = self._pool_chunks(self.encode_texts(chunk_texts, lengths), owners, len(stories))
+        else:
+            embeddings = self.encode_texts(self._story_texts(stories))
+
+        self._store_search(search_id, mode, embeddings)
         return embeddings
 
+    async def generate_embeddings_async(self, stories: List[Story], search_id: str, mode: str = 'title') -> np.ndarray:
+        """
+        Generate embeddings for a list of stories on the embedding worker.
+
+        The event loop stays free while the model runs, misses from concurrent
+        requests share micro-batches, and concurrent calls for the same
+        search_id and mode share one run.
+
+        Args:
+            stories: List of Story objects
+            search_id: Unique identifier for this search
+            mode: 'title' embeds titles, 'content' mean-pools chunks of title + article content
+
+        Returns:
+            numpy array of shape (n_stories, 384) containing embeddings
+        """
+        if not stories:
+            return np.array([])
+
+        # Check if embeddings already exist for this search
+        cached = self._get_cached_search(search_id, mode)
+        if cached is not None:
+            return cached
+
+        async def generate() -> np.ndarray:
+            print(f"Generating {mode} embeddings for {len(stories)} stories...")
+            if mode == 'content':
+                # Loading the model and tokenizing full articles would stall the event loop
+                chunk_texts, owners, lengths = await asyncio.to_thread(self._chunk_stories, stories)
+                chunk_embeddings = await self.encode_texts_async(chunk_texts, lengths)
+                embeddings = self._pool_chunks(chunk_embeddings, owners, len(stories))
+            else:
+                embeddings = await self.encode_texts_async(self._story_texts(stories))
+            self._store_search(search_id, mode, embeddings)
+            return embeddings
+
+        return await self.inflight.do(f"{search_id}:{mode}", generate)
+
     def get_embeddings(self, search_id: str) -> np.ndarray:
         """
         Retrieve cached embeddings for a search.
@@ -94,6 +452,18 @@ class EmbeddingService:
         """
         return self.search_embeddings.get(search_id, np.array([]))
 
+    def get_embedding_mode(self, search_id: str) -> Optional[str]:
+        """
+        Get the mode ('title' or 'content') of the cached embeddings for a search.
+
+        Args:
+            search_id: Search ID
+
+        Returns:
+            Embedding mode, or None if the search has no embeddings
+        """
+        return self.search_embedding_modes.get(search_id)
+
     def clear_embeddings(self, search_id: str):
         """
         Clear embeddings for a specific search from cache.
@@ -103,6 +473,7 @@ class EmbeddingService:
         """
         if search_id in self.search_embeddings:
             del self.search_embeddings[search_id]
+        self.search_embedding_modes.pop(search_id, None)
 
     def get_embedding_dim(self) -> int:
         """
@@ -113,6 +484,34 @@ class EmbeddingService:
         """
         return self.model.get_sentence_embedding_dimension()
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get encoding throughput, padding and chunking statistics.
+
+        Returns:
+            Dictionary with token/padding counters, worker and embedding store stats
+        """
+        with self._stats_lock:
+            batch = dict(self._batch_stats)
+            chunks = dict(self._chunk_stats)
+
+        padded = batch['padded_tokens']
+        return {
+            'backend': self.backend,
+            'model': self.model_name,
+            'batches': batch['batches'],
+            'texts': batch['texts'],
+            'tokens': batch['tokens'],
+            'padded_tokens': padded,
+            'padding_overhead': round((padded - batch['tokens']) / padded, 4) if padded else 0.0,
+            'measured_batches': batch['measured_batches'],
+            'tokens_per_second': round(batch['tokens'] / batch['measured_seconds'], 1)
+            if batch['measured_seconds'] else 0.0,
+            'chunking': chunks,
+            'worker': self.worker.stats(),
+            'store': self.embedding_cache.stats()
+        }
+
 
 # Global embedding service instance
 embedding_service = EmbeddingService()
@@ -0,0 +1,235 @@
+"""
+Embedding Store
+
+Content-addressed store of per-text embeddings, keyed by a hash of the
+model name and the preprocessed text. Two tiers:
+1. In-memory LRU of float32 vectors
+2. On-disk append-only float16 matrix (memory-mapped) plus a key -> row index
+
+Layout of the disk tier for each model:
+    <directory>/<model_slug>/meta.json     {"model": ..., "dim": ...}
+    <directory>/<model_slug>/vectors.f16   rows of dim float16 values
+    <directory>/<model_slug>/index.tsv     "<key>\t<row>" per line
+    <directory>/<model_slug>/store.lock    flock held while appending
+
+Several processes (e.g. uvicorn workers) may share a directory: appends
+take an exclusive flock, derive row numbers from the vector file size and
+first pick up index lines written by other processes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so processes must not share a directory
+    fcntl = None
+
+import numpy as np
+from cachetools import LRUCache
+
+
+class EmbeddingStore:
+    """Two-tier (memory LRU + memory-mapped disk) store of text embeddings."""
+
+    def __init__(self, model_name: str, memory_size: int, directory: Optional[str] = None):
+        """
+        Initialize the store. The disk tier is loaded on first use.
+
+        Args:
+            model_name: Embedding model name (part of every key)
+            memory_size: Maximum number of vectors kept in memory
+            directory: Root directory of the disk tier (None keeps memory only)
+        """
+        self.model_name = model_name
+        self.memory: LRUCache = LRUCache(maxsize=memory_size)
+        self.directory = None
+        if directory:
+            slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+            self.directory = os.path.join(directory, slug)
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dim: Optional[int] = None
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0  # Bytes of index.tsv already read
+        self._rows = 0
+        self._vectors: Optional[np.memmap] = None
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, text: str) -> str:
+        """
+        Build the content-addressed key of a preprocessed text.
+
+        Args:
+            text: Preprocessed text
+
+        Returns:
+            Hex digest of model name and text
+        """
+        return hashlib.sha1(f"{self.model_name}\n{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, name: str) -> str:
+        """Return the path of a file in the model's disk directory."""
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive flock on the model directory (caller holds the thread lock)."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path("store.lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """
+        Catch up with the files on disk (caller holds the thread and file locks).
+
+        Reads the row count from the vector file size and the index lines added
+        since the last sync, including those appended by other processes.
+        """
+        if self._dim is None:
+            if not os.path.exists(self._path("meta.json")):
+                return
+            with open(self._path("meta.json")) as f:
+                self._dim = json.load(f)["dim"]
+
+        if os.path.exists(self._path("vectors.f16")):
+            row_bytes = self._dim * 2
+            self._rows = os.path.getsize(self._path("vectors.f16")) // row_bytes
+            # Drop a partially written trailing row so later appends stay aligned
+            os.truncate(self._path("vectors.f16"), self._rows * row_bytes)
+        if not os.path.exists(self._path("index.tsv")):
+            return
+
+        # Index rows beyond the vector file belong to an interrupted write and are ignored
+        with open(self._path("index.tsv"), "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        self._index_offset += len(complete)
+        for line in complete.decode("utf-8").splitlines():
+            parts = line.split("\t")
+            if len(parts) == 2 and int(parts[1]) < self._rows:
+                self._index[parts[0]] = int(parts[1])
+
+    def _load(self):
+        """Load the disk index (caller holds the lock)."""
+        if self._loaded or self.directory is None:
+            self._loaded = True
+            return
+        self._loaded = True
+
+        if not os.path.exists(self._path("meta.json")):
+            return
+        with self._file_lock():
+            self._sync()
+        print(f"Embedding store loaded {len(self._index)} vectors from {self.directory}")
+
+    def _disk_vectors(self) -> np.memmap:
+        """Return a memory map covering every indexed row (caller holds the lock)."""
+        if self._vectors is None or self._vectors.shape[0] < self._rows:
+            self._vectors = np.memmap(
+                self._path("vectors.f16"), dtype=np.float16, mode="r", shape=(self._rows, self._dim)
+            )
+        return self._vectors
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up vectors for keys, memory tier first, then disk.
+
+        Args:
+            keys: Keys from make_key
+
+        Returns:
+            List aligned with keys holding float32 vectors or None for misses
+        """
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            self._load()
+            for key in keys:
+                vector = self.memory.get(key)
+                if vector is None and key in self._index:
+                    vector = np.asarray(self._disk_vectors()[self._index[key]], dtype=np.float32)
+                    self.memory[key] = vector
+                results.append(vector)
+
+            found = sum(1 for v in results if v is not None)
+            self.hits += found
+            self.misses += len(keys) - found
+        return results
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """
+        Store vectors in memory and append new ones to the disk tier.
+
+        Args:
+            keys: Keys from make_key
+            vectors: Array of shape (len(keys), dim)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            self._load()
+            for key, vector in zip(keys, vectors):
+                self.memory[key] = vector
+
+            if self.directory is None:
+                return
+
+            if not any(key not in self._index for key in keys):
+                return
+
+            with self._file_lock():
+                # Row numbers come from the file as it is now, after other processes' appends
+                self._sync()
+                new_rows = []
+                seen = set()
+                for key, vector in zip(keys, vectors):
+                    if key not in self._index and key not in seen:
+                        seen.add(key)
+                        new_rows.append((key, vector))
+                if not new_rows:
+                    return
+
+                if self._dim is None:
+                    self._dim = vectors.shape[1]
+                    with open(self._path("meta.json"), "w") as f:
+                        json.dump({"model": self.model_name, "dim": self._dim}, f)
+
+                # Vectors are written before the index so a crash never indexes missing rows
+                start_row = self._rows
+                with open(self._path("vectors.f16"), "ab") as f:
+                    f.write(np.stack([v for _, v in new_rows]).astype(np.float16).tobytes())
+                lines = "".join(f"{key}\t{start_row + i}\n" for i, (key, _) in enumerate(new_rows))
+                with open(self._path("index.tsv"), "a") as f:
+                    f.write(lines)
+                for i, (key, _) in enumerate(new_rows):
+                    self._index[key] = start_row + i
+                self._rows += len(new_rows)
+                self._index_offset += len(lines.encode("utf-8"))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary with memory/disk sizes and hit/miss counters
+        """
+        with self._lock:
+            return {
+                "memory_entries": len(self.memory),
+                "disk_entries": len(self._index),
+                "hits": self.hits,
+                "misses": self.misses
+            }
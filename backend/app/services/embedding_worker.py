@@ -0,0 +1,176 @@
+"""
+Embedding Worker
+
+Dedicated thread that owns model inference. Encode jobs from concurrent
+requests are queued, merged into shared micro-batches of up to batch_size
+texts (taken round-robin across jobs so a large job can't starve small
+ones), and each caller gets its own slice back through a future.
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class EncodeJob:
+    """A list of texts submitted by one caller."""
+    texts: List[str]
+    future: Future
+    lengths: List[Optional[int]] = field(default_factory=list)
+    results: List[Optional[np.ndarray]] = field(default_factory=list)
+    next_index: int = 0
+    done_count: int = 0
+
+
+class EmbeddingWorker:
+    """Single inference thread that micro-batches encode jobs from many callers."""
+
+    def __init__(self, encode_fn: Callable[[List[str], List[Optional[int]]], np.ndarray], batch_size: int):
+        """
+        Initialize the worker. The thread is started on first use.
+
+        Args:
+            encode_fn: Function encoding a list of texts and their token counts
+                (None where unknown) into an (n, dim) array
+            batch_size: Maximum number of texts per micro-batch
+        """
+        self.encode_fn = encode_fn
+        self.batch_size = max(1, batch_size)
+        self._queue: "queue.Queue[Optional[EncodeJob]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.jobs = 0
+        self.batches = 0
+        self.texts = 0
+
+    def start(self):
+        """Start the inference thread if it is not running."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-worker", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the inference thread after the current micro-batch.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, texts: List[str], lengths: Optional[List[Optional[int]]] = None) -> Future:
+        """
+        Queue texts for encoding. Safe to call from any thread.
+
+        Args:
+            texts: Texts to encode
+            lengths: Token count of each text if the caller already knows it
+
+        Returns:
+            Future resolving to an array of shape (len(texts), dim)
+        """
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.empty((0, 0), dtype=np.float32))
+            return future
+
+        self.start()
+        lengths = list(lengths) if lengths is not None else [None] * len(texts)
+        self._queue.put(EncodeJob(texts=list(texts), future=future, lengths=lengths, results=[None] * len(texts)))
+        return future
+
+    async def encode(self, texts: List[str], lengths: Optional[List[Optional[int]]] = None) -> np.ndarray:
+        """
+        Encode texts without blocking the event loop.
+
+        Args:
+            texts: Texts to encode
+            lengths: Token count of each text if the caller already knows it
+
+        Returns:
+            Array of shape (len(texts), dim)
+        """
+        return await asyncio.wrap_future(self.submit(texts, lengths))
+
+    def _next_batch(self, active: List[EncodeJob]) -> List[tuple]:
+        """Take up to batch_size (job, index) pairs round-robin across active jobs."""
+        batch = []
+        while len(batch) < self.batch_size:
+            took_any = False
+            for job in active:
+                if job.next_index < len(job.texts) and len(batch) < self.batch_size:
+                    batch.append((job, job.next_index))
+                    job.next_index += 1
+                    took_any = True
+            if not took_any:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop: collect queued jobs, encode one micro-batch, resolve finished jobs."""
+        active: List[EncodeJob] = []
+        stopping = False
+
+        while not (stopping and not active):
+            # Block only when idle, otherwise just pick up newly queued jobs
+            try:
+                job = self._queue.get(block=not active)
+                while True:
+                    if job is None:
+                        stopping = True
+                    elif job.future.set_running_or_notify_cancel():
+                        active.append(job)
+                        self.jobs += 1
+                    job = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            if not active:
+                continue
+
+            batch = self._next_batch(active)
+            try:
+                vectors = self.encode_fn([job.texts[idx] for job, idx in batch],
+                                         [job.lengths[idx] for job, idx in batch])
+            except Exception as e:
+                for job in {id(job): job for job, _ in batch}.values():
+                    job.future.set_exception(e)
+                active = [job for job in active if not job.future.done()]
+                continue
+
+            self.batches += 1
+            self.texts += len(batch)
+            for (job, idx), vector in zip(batch, vectors):
+                job.results[idx] = vector
+                job.done_count += 1
+
+            for job in active:
+                if job.done_count == len(job.texts):
+                    job.future.set_result(np.stack(job.results))
+            active = [job for job in active if not job.future.done()]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get worker statistics.
+
+        Returns:
+            Dictionary with job, micro-batch and text counters
+        """
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queued_jobs": self._queue.qsize(),
+            "jobs": self.jobs,
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0
+        }
@@ -1,14 +1,29 @@
 import asyncio
+import hashlib
+import importlib.util
+import itertools
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 import httpx
-import uuid
-from bs4 import BeautifulSoup
 from app.config import settings
 from app.models import Story, StoryStats
+from app.services.bounded_cache import BoundedCache
+from app.services.content_cache import ContentCache
+from app.services.fetch_scheduler import FetchScheduler
+from app.services.html_extractor import extract_content, resolve_parser
+from app.services.singleflight import SingleFlight
 
 ALGOLIA_URL = "https://hn.algolia.com/api/v1"
+STORY_OVERHEAD_BYTES = 1500  # Approximate size of a Story object without its strings
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml", "text/plain"}
+ARTICLE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
 
 
 class HackerNewsService:
@@ -16,7 +31,250 @@ class HackerNewsService:
 
     def __init__(self):
         """Initialize Hacker News API client."""
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.cache = BoundedCache(
+            name="search_cache",
+            max_bytes=settings.SEARCH_CACHE_MAX_BYTES,
+            ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+            size_of=self._estimate_entry_size
+        )
+        # Each fetch gets its own search ID; the canonical ID of a query points at the latest one
+        self.latest_search_ids: Dict[str, str] = {}
+        self._generations = itertools.count(1)
+        self.cache.add_eviction_listener(self._forget_search)
+        self.inflight = SingleFlight()
+        self.client: Optional[httpx.AsyncClient] = None
+        self.fetch_scheduler = FetchScheduler(
+            max_concurrency=settings.CONTENT_FETCH_CONCURRENCY,
+            per_host_concurrency=settings.CONTENT_FETCH_PER_HOST
+        )
+        self.html_parser = resolve_parser(settings.HTML_PARSER)
+        self.extraction_pool: Optional[ProcessPoolExecutor] = None
+        self.content_cache: Optional[ContentCache] = None
+        if settings.CONTENT_CACHE_ENABLED:
+            self.content_cache = ContentCache(
+                path=settings.resolve_path(settings.CONTENT_CACHE_PATH),
+                ttl_seconds=settings.CONTENT_CACHE_TTL_SECONDS,
+                max_age_seconds=settings.CONTENT_CACHE_MAX_AGE_SECONDS,
+                max_bytes=settings.CONTENT_CACHE_MAX_BYTES
+            )
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client shared by all requests of this service."""
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+        # HTTP/2 needs the optional 'h2' package (httpx[http2])
+        http2 = settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+        if settings.HTTP2_ENABLED and not http2:
+            print("Warning: HTTP/2 requested but 'h2' is not installed. Falling back to HTTP/1.1.")
+        return httpx.AsyncClient(limits=limits, http2=http2, timeout=30.0)
+
+    async def start(self):
+        """Open the shared HTTP client pool and extraction pool. Called from the FastAPI lifespan."""
+        if self.client is None or self.client.is_closed:
+            self.client = self._create_client()
+        self._get_extraction_pool()
+
+    async def close(self):
+        """Close the shared HTTP client pool and release its connections."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.extraction_pool is not None:
+            self.extraction_pool.shutdown(wait=False, cancel_futures=True)
+            self.extraction_pool = None
+        if self.content_cache is not None:
+            self.content_cache.close()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it if the lifespan has not started it."""
+        if self.client is None or self.client.is_closed:
+            self.client = self._create_client()
+        return self.client
+
+    async def _fetch_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a single page of Algolia search_by_date results."""
+        client = self._get_client()
+        response = await client.get(f"{ALGOLIA_URL}/search_by_date", params=params, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_window(
+        self,
+        query: str,
+        numeric_filters: List[str],
+        needed: int
+    ) -> tuple[List[Dict[str, Any]], bool, int]:
+        """
+        Fetch up to `needed` hits from one created_at_i window.
+
+        The first page reports how many hits the window holds; the remaining
+        pages are then requested concurrently.
+
+        Args:
+            query: Search query string
+            numeric_filters: Algolia numeric filters bounding the window
+            needed: Number of hits still required
+
+        Returns:
+            Tuple of (hits, whether the window is exhausted, request count)
+        """
+        per_page = max(1, min(needed, settings.ALGOLIA_HITS_PER_PAGE))
+        params = {
+            "query": query,
+            "tags": "story",  # Only stories, not comments
+            "hitsPerPage": per_page,
+            "page": 0
+        }
+        if numeric_filters:
+            params["numericFilters"] = ",".join(numeric_filters)
+
+        first_page = await self._fetch_page(params)
+        hits = list(first_page.get("hits", []))
+
+        # nbPages is already capped by Algolia's pagination limit
+        reachable_pages = min(
+            first_page.get("nbPages", 0),
+            max(1, settings.ALGOLIA_PAGINATION_LIMIT // per_page)
+        )
+        wanted_pages = max(1, min(reachable_pages, math.ceil(needed / per_page)))
+
+        semaphore = asyncio.Semaphore(settings.ALGOLIA_PAGE_CONCURRENCY)
+
+        async def fetch_page(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._fetch_page({**params, "page": page})
+
+        pages = await asyncio.gather(*(fetch_page(page) for page in range(1, wanted_pages)))
+        for page in pages:
+            hits.extend(page.get("hits", []))
+
+        exhausted = len(hits) >= first_page.get("nbHits", 0)
+        return hits, exhausted, wanted_pages
+
+    async def _fetch_hits(
+        self,
+        query: str,
+        limit: int,
+        days: int
+    ) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Fetch up to `limit` story hits, paginating past Algolia's page size.
+
+        Results are ordered newest first, so once a window runs into Algolia's
+        pagination limit the upper created_at_i bound is moved to the oldest
+        hit seen and the walk continues. Hits are deduped by objectID.
+
+        Args:
+            query: Search query string
+            limit: Maximum number of hits (capped by MAX_STORIES_PER_SEARCH)
+            days: Number of days to look back
+
+        Returns:
+            Tuple of (hits, fetch stats with request count and elapsed milliseconds)
+        """
+        start_time = time.perf_counter()
+        limit = min(limit, settings.MAX_STORIES_PER_SEARCH)
+
+        lower_filter = None
+        if days:
+            timestamp = int((datetime.utcnow() - timedelta(days=days)).timestamp())
+            lower_filter = f"created_at_i>{timestamp}"
+        upper_filter = None
+
+        hits_by_id: Dict[str, Dict[str, Any]] = {}
+        request_count = 0
+        window_count = 0
+
+        while len(hits_by_id) < limit:
+            filters = [f for f in (lower_filter, upper_filter) if f]
+            window_hits, exhausted, requests = await self._fetch_window(
+                query, filters, limit - len(hits_by_id)
+            )
+            request_count += requests
+            window_count += 1
+
+            new_hits = 0
+            for hit in window_hits:
+                object_id = str(hit.get("objectID", ""))
+                if object_id and object_id not in hits_by_id:
+                    hits_by_id[object_id] = hit
+                    new_hits += 1
+
+            if exhausted or new_hits == 0:
+                break
+
+            # Walk the created_at_i window back past the oldest hit seen
+            timestamps = [hit["created_at_i"] for hit in window_hits if hit.get("created_at_i")]
+            if not timestamps:
+                break
+            upper_filter = f"created_at_i<={min(timestamps)}"
+
+        hits = list(hits_by_id.values())[:limit]
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        print(f"Fetched {len(hits)} hits for '{query}' in {request_count} requests ({elapsed_ms:.0f} ms)")
+
+        return hits, {
+            "requests": request_count,
+            "windows": window_count,
+            "hits": len(hits),
+            "elapsed_ms": round(elapsed_ms, 1)
+        }
+
+    def _make_search_id(self, kind: str, query: str, limit: int, days: int) -> str:
+        """
+        Build a deterministic canonical ID from the canonical form of a query.
+
+        Identical searches from different users map to the same canonical ID,
+        so they share the latest fetch and its embeddings and clusters.
+
+        Args:
+            kind: Search kind ('search' or 'content')
+            query: Search query string
+            limit: Maximum number of results
+            days: Number of days to look back
+
+        Returns:
+            Canonical ID string
+        """
+        canonical_query = " ".join(query.lower().split())
+        limit = min(limit, settings.MAX_STORIES_PER_SEARCH)
+        canonical_key = f"{kind}|{canonical_query}|{limit}|{days}"
+        digest = hashlib.sha1(canonical_key.encode("utf-8")).hexdigest()[:10]
+        return f"{canonical_query}_{digest}"
+
+    def _get_recent_search(self, canonical_id: str) -> Optional[tuple[str, Dict[str, Any]]]:
+        """Return the latest search ID and entry for a query if it is recent enough to reuse."""
+        search_id = self.latest_search_ids.get(canonical_id)
+        entry = self.cache.get(search_id) if search_id is not None else None
+        if entry is None:
+            return None
+        age = (datetime.utcnow() - entry['timestamp']).total_seconds()
+        return (search_id, entry) if age <= settings.SEARCH_REUSE_SECONDS else None
+
+    def _store_search(self, canonical_id: str, entry: Dict[str, Any]) -> str:
+        """
+        Cache a fetch under a new search ID and make it the latest for its query.
+
+        Earlier fetches of the same query stay cached under their own IDs until
+        they expire or are evicted, so users still viewing them keep their
+        stories, embeddings and clusters.
+
+        Returns:
+            Search ID of the stored fetch
+        """
+        search_id = f"{canonical_id}-{next(self._generations)}"
+        self.cache.set(search_id, {**entry, 'canonical_id': canonical_id})
+        self.latest_search_ids[canonical_id] = search_id
+        return search_id
+
+    def _forget_search(self, search_id: str):
+        """Drop the latest-fetch pointer of a query when its search leaves the cache."""
+        canonical_id = search_id.rsplit("-", 1)[0]
+        if self.latest_search_ids.get(canonical_id) == search_id:
+            del self.latest_search_ids[canonical_id]
 
     async def search_stories(
         self, 
@@ -28,6 +286,9 @@ class HackerNewsService:
         """
         Search for Hacker News stories on a given topic.
 
+        Recent identical searches are served from the cache, and concurrent
+        identical searches share a single in-flight fetch.
+
         Args:
             query: Search query string
             section: Section identifier (top or bottom)
@@ -37,70 +298,78 @@ class HackerNewsService:
         Returns:
             Tuple of (stories list, stats, search_id)
         """
-        endpoint = "search_by_date"
-        
-        params = {
-            "query": query,
-            "hitsPerPage": min(limit, settings.MAX_STORIES_PER_SEARCH),
-            "tags": "story"  # Only stories, not comments
-        }
-        
-        # Add date filter
-        if days:
-            timestamp = int((datetime.utcnow() - timedelta(days=days)).timestamp())
-            params["numericFilters"] = f"created_at_i>{timestamp}"
+        canonical_id = self._make_search_id("search", query, limit, days)
+        recent = self._get_recent_search(canonical_id)
+        if recent is not None:
+            search_id, entry = recent
+            print(f"Reusing cached search: {search_id}")
+            return entry['stories'], entry['stats'], search_id
+
+        return await self.inflight.do(
+            canonical_id,
+            lambda: self._search_stories(canonical_id, query, section, limit, days)
+        )
 
+    async def _search_stories(
+        self,
+        canonical_id: str,
+        query: str,
+        section: str,
+        limit: int,
+        days: int
+    ) -> tuple[List[Story], StoryStats, str]:
+        """Fetch stories from Algolia and cache them under a new search ID for canonical_id."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{ALGOLIA_URL}/{endpoint}", params=params, timeout=30.0)
-                response.raise_for_status()
-                data = response.json()
-
-                # Process stories
-                stories = []
-                if data.get("hits"):
-                    for hit in data.get("hits", []):
-                        # Parse created_at date
-                        created_at_str = hit.get("created_at")
-                        if created_at_str:
-                            # Handle ISO format with or without timezone
-                            try:
-                                if created_at_str.endswith("Z"):
-                                    created_at_str = created_at_str.replace("Z", "+00:00")
-                                created_at = datetime.fromisoformat(created_at_str)
-                            except (ValueError, AttributeError):
-                                # Fallback to current time if parsing fails
-                                created_at = datetime.utcnow()
-                        else:
+            hits, fetch_stats = await self._fetch_hits(query, limit, days)
+
+            # Process stories
+            stories = []
+            if hits:
+                for hit in hits:
+                    # Parse created_at date
+                    created_at_str = hit.get("created_at")
+                    if created_at_str:
+                        # Handle ISO format with or without timezone
+                        try:
+                            if created_at_str.endswith("Z"):
+                                created_at_str = created_at_str.replace("Z", "+00:00")
+                            created_at = datetime.fromisoformat(created_at_str)
+                        except (ValueError, AttributeError):
+                            # Fallback to current time if parsing fails
                             created_at = datetime.utcnow()
-                        
-                        story = Story(
-                            id=str(hit.get("objectID", "")),
-                            title=hit.get("title", ""),
-                            text=hit.get("title", ""),  # Use title as text for embedding
-                            url=hit.get("url"),
-                            score=hit.get("points", 0),
-                            author=hit.get("author", ""),
-                            created_at=created_at,
-                            comments_count=hit.get("num_comments", 0),
-                            hn_url=f"https://news.ycombinator.com/item?id={hit.get('objectID')}"
-                        )
-                        stories.append(story)
-
-                # Calculate statistics
-                stats = self._calculate_stats(stories)
-
-                # Generate search ID and cache results
-                search_id = f"{section}_{query}_{uuid.uuid4().hex[:8]}"
-                self.cache[search_id] = {
-                    'stories': stories,
-                    'stats': stats,
-                    'query': query,
-                    'section': section,
-                    'timestamp': datetime.utcnow()
-                }
-
-                return stories, stats, search_id
+                    else:
+                        created_at = datetime.utcnow()
+                    
+                    story = Story(
+                        id=str(hit.get("objectID", "")),
+                        title=hit.get("title", ""),
+                        text=hit.get("title", ""),  # Use title as text for embedding
+                        url=hit.get("url"),
+                        score=hit.get("points", 0),
+                        author=hit.get("author", ""),
+                        created_at=created_at,
+                        comments_count=hit.get("num_comments", 0),
+                        hn_url=f"https://news.ycombinator.com/item?id={hit.get('objectID')}"
+                    )
+                    stories.append(story)
+
+            # Calculate statistics
+            stats = self._calculate_stats(stories)
+
+            # Cache results
+            search_id = self._store_search(canonical_id, {
+                'stories': stories,
+                'stats': stats,
+                'kind': 'search',
+                'query': query,
+                'section': section,
+                'fetch_stats': fetch_stats,
+                'limit': limit,
+                'days': days,
+                'timestamp': datetime.utcnow()
+            })
+
+            return stories, stats, search_id
 
         except httpx.HTTPError as e:
             print(f"Hacker News API Error: {e}")
@@ -141,60 +410,144 @@ class HackerNewsService:
         except Exception:
             return None
 
-    async def _fetch_article_content(self, url: str, timeout: float = 10.0) -> Dict[str, Any]:
-        """Fetch and extract article content from a URL."""
-        if not url:
-            return {"success": False, "error": "No URL provided"}
+    def _get_extraction_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Return the HTML extraction process pool (None when EXTRACTION_WORKERS is 0)."""
+        if self.extraction_pool is None and settings.EXTRACTION_WORKERS > 0:
+            # The pool starts once the embedding worker and torch threads may be running;
+            # forking a multi-threaded process can deadlock the children, so don't fork it
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self.extraction_pool = ProcessPoolExecutor(
+                max_workers=settings.EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context(start_method)
+            )
+            print(f"HTML extraction using {settings.EXTRACTION_WORKERS} worker processes ({self.html_parser})")
+        return self.extraction_pool
 
-        try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
+    async def _extract(self, html: str) -> Dict[str, Any]:
+        """
+        Extract title and text from HTML off the event loop.
 
-                soup = BeautifulSoup(response.text, "html.parser")
+        Args:
+            html: Page HTML
 
-                # Strip out noise
-                for tag in soup(["script", "style", "nav", "header", "footer", "aside", "ads"]):
-                    tag.decompose()
+        Returns:
+            Dictionary with 'title' and 'content' keys
+        """
+        pool = self._get_extraction_pool()
+        loop = asyncio.get_running_loop()
+        # Without a process pool, fall back to the default thread pool
+        return await loop.run_in_executor(pool, extract_content, html, self.html_parser)
+
+    def _cached_content_result(self, cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a content result dict from a content cache entry."""
+        return {
+            "success": True,
+            "title": cached["title"],
+            "content": cached["content"],
+            "content_length": len(cached["content"]),
+            "from_cache": True
+        }
 
-                # Title extraction
-                title = None
-                if soup.title:
-                    title = soup.title.string
-                elif soup.find("h1"):
-                    title = soup.find("h1").get_text(strip=True)
+    async def _read_capped(self, response: httpx.Response, max_bytes: int) -> str:
+        """
+        Read a streamed response body, stopping once max_bytes have arrived.
 
-                # Content extraction
-                content = ""
-                article = soup.find("article")
-                if article:
-                    content = article.get_text(separator="\n", strip=True)
-                else:
-                    for selector in ["main", ".content", ".post-content", ".article-body", "#content"]:
-                        elem = soup.select_one(selector)
-                        if elem:
-                            content = elem.get_text(separator="\n", strip=True)
-                            break
+        Args:
+            response: Streaming response
+            max_bytes: Maximum number of body bytes to read
 
-                    if not content and soup.body:
-                        content = soup.body.get_text(separator="\n", strip=True)
+        Returns:
+            Decoded body text (possibly truncated)
+        """
+        chunks = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            chunk = chunk[:max_bytes - received]
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= max_bytes:
+                break
+
+        body = b"".join(chunks)
+        try:
+            return body.decode(response.charset_encoding or "utf-8", errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")
 
-                lines = [line.strip() for line in content.split("\n") if line.strip()]
-                content = "\n".join(lines)
+    async def _fetch_article_content(self, url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Fetch and extract article content from a URL."""
+        if timeout is None:
+            timeout = settings.CONTENT_FETCH_TIMEOUT
+        if not url:
+            return {"success": False, "error": "No URL provided"}
 
-                max_chars = 5000
-                if len(content) > max_chars:
-                    content = content[:max_chars] + "... [truncated]"
+        cached = None
+        if self.content_cache is not None:
+            try:
+                cached = await asyncio.to_thread(self.content_cache.get, url)
+            except Exception as e:
+                print(f"Error reading cached content for {url}: {e}")
+            if cached and cached["fresh"]:
+                return self._cached_content_result(cached)
 
-                return {
-                    "success": True,
-                    "title": title,
-                    "content": content,
-                    "content_length": len(content)
-                }
+        try:
+            headers = dict(ARTICLE_HEADERS)
+            if cached:
+                # Revalidate the stale entry instead of downloading it again
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            client = self._get_client()
+            async with client.stream(
+                "GET",
+                url,
+                headers=headers,
+                timeout=timeout,
+                follow_redirects=True
+            ) as response:
+                if response.status_code == 304 and cached:
+                    try:
+                        await asyncio.to_thread(self.content_cache.touch, url)
+                    except Exception as e:
+                        print(f"Error caching content for {url}: {e}")
+                    return self._cached_content_result(cached)
+                response.raise_for_status()
+
+                # Skip PDFs, images and other binaries without downloading them
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type and content_type not in HTML_CONTENT_TYPES:
+                    return {"success": False, "error": f"Unsupported content type: {content_type}"}
+
+                html = await self._read_capped(response, settings.CONTENT_MAX_BYTES)
+                etag = response.headers.get("etag")
+                last_modified = response.headers.get("last-modified")
+
+            extracted = await self._extract(html)
+            title = extracted["title"]
+            content = extracted["content"]
+
+            if self.content_cache is not None:
+                # A cache write failure (locked database, full disk) must not fail the fetch
+                try:
+                    await asyncio.to_thread(
+                        self.content_cache.put,
+                        url,
+                        title,
+                        content,
+                        etag,
+                        last_modified
+                    )
+                except Exception as e:
+                    print(f"Error caching content for {url}: {e}")
+
+            return {
+                "success": True,
+                "title": title,
+                "content": content,
+                "content_length": len(content)
+            }
 
         except httpx.TimeoutException:
             return {"success": False, "error": "Timeout"}
@@ -213,32 +566,41 @@ class HackerNewsService:
         """
         Search for Hacker News stories and fetch article content in parallel.
         Will fetch all results up to the specified limit from the lookback window.
+        Content fetches are bounded globally and per host; URLs still pending when
+        CONTENT_FETCH_DEADLINE runs out are reported as failed fetches.
+        Recent and concurrent identical searches are coalesced like search_stories.
         """
-        endpoint = "search_by_date"
-
-        params = {
-            "query": query,
-            "hitsPerPage": min(limit, settings.MAX_STORIES_PER_SEARCH),
-            "tags": "story"
-        }
-
-        if days:
-            timestamp = int((datetime.utcnow() - timedelta(days=days)).timestamp())
-            params["numericFilters"] = f"created_at_i>{timestamp}"
+        canonical_id = self._make_search_id("content", query, limit, days)
+        recent = self._get_recent_search(canonical_id)
+        if recent is not None:
+            search_id, entry = recent
+            print(f"Reusing cached search: {search_id}")
+            return entry['stories'], entry['stats'], search_id
+
+        return await self.inflight.do(
+            canonical_id,
+            lambda: self._search_stories_with_content(canonical_id, query, section, limit, days)
+        )
 
+    async def _search_stories_with_content(
+        self,
+        canonical_id: str,
+        query: str,
+        section: str,
+        limit: int,
+        days: int
+    ) -> tuple[List[Story], StoryStats, str]:
+        """Fetch stories and article content, and cache them under a new search ID for canonical_id."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{ALGOLIA_URL}/{endpoint}", params=params, timeout=30.0)
-                response.raise_for_status()
-                data = response.json()
-
-            hits = data.get("hits", [])
+            hits, fetch_stats = await self._fetch_hits(query, limit, days)
             urls = [hit.get("url") for hit in hits]
 
-            content_results = await asyncio.gather(
-                *(self._fetch_article_content(url) for url in urls),
-                return_exceptions=True
+            content_results, content_stats = await self.fetch_scheduler.run(
+                urls,
+                self._fetch_article_content,
+                deadline=settings.CONTENT_FETCH_DEADLINE
             )
+            fetch_stats["content"] = content_stats
 
             stories = []
             for idx, hit in enumerate(hits):
@@ -280,14 +642,17 @@ class HackerNewsService:
                 stories.append(story)
 
             stats = self._calculate_stats(stories)
-            search_id = f"{section}_{query}_{uuid.uuid4().hex[:8]}"
-            self.cache[search_id] = {
+            search_id = self._store_search(canonical_id, {
                 'stories': stories,
                 'stats': stats,
+                'kind': 'content',
                 'query': query,
                 'section': section,
+                'fetch_stats': fetch_stats,
+                'limit': limit,
+                'days': days,
                 'timestamp': datetime.utcnow()
-            }
+            })
 
             return stories, stats, search_id
 
@@ -298,6 +663,34 @@ class HackerNewsService:
             print(f"Unexpected error: {e}")
             return [], StoryStats(count=0, most_upvoted=None), f"{section}_{query}_error"
 
+    async def refresh_search(self, search_id: str) -> Optional[tuple[List[Story], StoryStats, str]]:
+        """
+        Re-fetch a cached search, bypassing the reuse window.
+
+        The new stories get a new search ID that becomes the latest for the
+        query; the old search keeps its stories, embeddings and clusters, which
+        can seed incremental placement of the new stories.
+
+        Args:
+            search_id: Search ID from previous search
+
+        Returns:
+            Tuple of (stories list, stats, new search_id), or None if the search is not cached
+        """
+        entry = self.cache.get(search_id)
+        if entry is None:
+            return None
+
+        if entry['kind'] == 'content':
+            fetch = self._search_stories_with_content
+        else:
+            fetch = self._search_stories
+        canonical_id = entry['canonical_id']
+        return await self.inflight.do(
+            canonical_id,
+            lambda: fetch(canonical_id, entry['query'], entry['section'], entry['limit'], entry['days'])
+        )
+
     def get_cached_stories(self, search_id: str) -> List[Story]:
         """
         Retrieve cached stories by search ID.
@@ -308,10 +701,26 @@ class HackerNewsService:
         Returns:
             List of Story objects
         """
-        if search_id in self.cache:
-            return self.cache[search_id]['stories']
+        entry = self.cache.get(search_id)
+        if entry is not None:
+            return entry['stories']
         return []
 
+    def get_fetch_stats(self, search_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the Algolia fetch cost recorded for a search.
+
+        Args:
+            search_id: Search ID from previous search
+
+        Returns:
+            Dictionary with request count and elapsed milliseconds, or None
+        """
+        entry = self.cache.get(search_id)
+        if entry is not None:
+            return entry.get('fetch_stats')
+        return None
+
     def get_cached_stats(self, search_id: str) -> StoryStats:
         """
         Retrieve cached stats by search ID.
@@ -322,8 +731,9 @@ class HackerNewsService:
         Returns:
             StoryStats object
         """
-        if search_id in self.cache:
-            return self.cache[search_id]['stats']
+        entry = self.cache.get(search_id)
+        if entry is not None:
+            return entry['stats']
         return StoryStats(count=0, most_upvoted=None)
 
     def clear_old_cache(self, max_age_hours: int = 24):
@@ -333,15 +743,38 @@ class HackerNewsService:
         Args:
             max_age_hours: Maximum age in hours before clearing
         """
-        current_time = datetime.utcnow()
-        expired_keys = []
+        self.cache.sweep(max_age_seconds=max_age_hours * 3600)
 
-        for search_id, data in self.cache.items():
-            if (current_time - data['timestamp']).total_seconds() > (max_age_hours * 3600):
-                expired_keys.append(search_id)
+    async def run_cache_sweeper(self, interval_seconds: float):
+        """
+        Periodically expire search cache entries past their TTL.
+        Started as a background task from the FastAPI lifespan.
 
-        for key in expired_keys:
-            del self.cache[key]
+        Args:
+            interval_seconds: Seconds between sweeps
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            expired = self.cache.sweep()
+            if expired:
+                print(f"Search cache sweep expired {expired} entries")
+
+    def _estimate_entry_size(self, entry: Dict[str, Any]) -> int:
+        """
+        Estimate the memory footprint of a search cache entry in bytes.
+
+        Args:
+            entry: Cache entry with 'stories' list
+
+        Returns:
+            Approximate size in bytes
+        """
+        size = 1024  # Entry dict, stats and fetch_stats
+        for story in entry.get('stories', []):
+            size += STORY_OVERHEAD_BYTES
+            size += len(story.title) + len(story.text) + len(story.author)
+            size += len(story.url or "") + len(story.content or "") + len(story.hn_url or "")
+        return size
 
 
 # Global Hacker News service instance
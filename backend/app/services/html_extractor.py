@@ -0,0 +1,179 @@
+"""
+HTML Extractor
+
+Extracts the title and main text of an article page. This is CPU-bound work,
+so HackerNewsService runs it in a process pool; everything here is plain
+module-level functions so it can be pickled into worker processes.
+
+Parser backends (fastest first):
+- selectolax: Lexbor-based parser (optional dependency)
+- lxml: BeautifulSoup with the lxml tree builder (optional dependency)
+- html.parser: BeautifulSoup with the stdlib parser (always available, used as fallback)
+"""
+
+import importlib.util
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from bs4 import BeautifulSoup
+
+PARSER_PREFERENCE = ["selectolax", "lxml", "html.parser"]
+NOISE_TAGS = ["script", "style", "nav", "header", "footer", "aside", "ads"]
+CONTENT_SELECTORS = ["main", ".content", ".post-content", ".article-body", "#content"]
+MAX_CONTENT_CHARS = 5000
+
+
+def available_parsers() -> List[str]:
+    """
+    List the parser backends that can be used in this environment.
+
+    Returns:
+        Parser names in order of preference
+    """
+    return [
+        name for name in PARSER_PREFERENCE
+        if name == "html.parser" or importlib.util.find_spec(name) is not None
+    ]
+
+
+def resolve_parser(name: str) -> str:
+    """
+    Resolve a configured parser name to an installed backend.
+
+    Args:
+        name: 'auto', 'selectolax', 'lxml' or 'html.parser'
+
+    Returns:
+        Installed parser name ('html.parser' if the requested one is missing)
+    """
+    available = available_parsers()
+    if name == "auto":
+        return available[0]
+    if name not in available:
+        print(f"Warning: HTML parser '{name}' is not available. Falling back to html.parser.")
+        return "html.parser"
+    return name
+
+
+def _clean_text(content: str, max_chars: int) -> str:
+    """Drop blank lines, strip whitespace and truncate to max_chars."""
+    lines = [line.strip() for line in content.split("\n") if line.strip()]
+    content = "\n".join(lines)
+
+    if len(content) > max_chars:
+        content = content[:max_chars] + "... [truncated]"
+    return content
+
+
+def _collect_text(strings: Iterable[str], max_chars: int) -> str:
+    """Join stripped text nodes, stopping once enough text has been collected."""
+    collected = []
+    total = 0
+    for text in strings:
+        collected.append(text)
+        total += len(text) + 1
+        if total > max_chars:
+            break
+    return "\n".join(collected)
+
+
+def _extract_with_soup(html: str, features: str, max_chars: int) -> Tuple[Optional[str], str]:
+    """Extract (title, text) using BeautifulSoup with the given tree builder."""
+    soup = BeautifulSoup(html, features)
+
+    # Strip out noise
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+
+    # Title extraction
+    title = None
+    if soup.title:
+        title = soup.title.string
+    elif soup.find("h1"):
+        title = soup.find("h1").get_text(strip=True)
+
+    # Content extraction
+    content = ""
+    article = soup.find("article")
+    if article:
+        content = _collect_text(article.stripped_strings, max_chars)
+    else:
+        for selector in CONTENT_SELECTORS:
+            elem = soup.select_one(selector)
+            if elem:
+                content = _collect_text(elem.stripped_strings, max_chars)
+                break
+
+        if not content and soup.body:
+            content = _collect_text(soup.body.stripped_strings, max_chars)
+
+    return (str(title) if title is not None else None), content
+
+
+def _extract_with_selectolax(html: str) -> Tuple[Optional[str], str]:
+    """Extract (title, text) using selectolax, mirroring the BeautifulSoup rules."""
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:
+        # Older selectolax releases only ship the Modest backend
+        from selectolax.parser import HTMLParser
+
+    tree = HTMLParser(html)
+
+    # Strip out noise
+    tree.strip_tags(NOISE_TAGS)
+
+    # Title extraction
+    title = None
+    title_node = tree.css_first("title")
+    if title_node is not None:
+        title = title_node.text(strip=True)
+    else:
+        h1 = tree.css_first("h1")
+        if h1 is not None:
+            title = h1.text(strip=True)
+
+    # Content extraction
+    content = ""
+    article = tree.css_first("article")
+    if article is not None:
+        content = article.text(separator="\n", strip=True)
+    else:
+        for selector in CONTENT_SELECTORS:
+            elem = tree.css_first(selector)
+            if elem is not None:
+                content = elem.text(separator="\n", strip=True)
+                break
+
+        if not content and tree.body is not None:
+            content = tree.body.text(separator="\n", strip=True)
+
+    return title, content
+
+
+def extract_content(
+    html: str,
+    parser: str = "html.parser",
+    max_chars: int = MAX_CONTENT_CHARS
+) -> Dict[str, Any]:
+    """
+    Extract the title and main text content from an HTML page.
+
+    Args:
+        html: Page HTML
+        parser: Resolved parser backend name
+        max_chars: Maximum number of content characters to keep
+
+    Returns:
+        Dictionary with 'title' and 'content' keys
+    """
+    if parser == "selectolax":
+        try:
+            title, content = _extract_with_selectolax(html)
+        except Exception:
+            title, content = _extract_with_soup(html, "html.parser", max_chars)
+    else:
+        title, content = _extract_with_soup(html, parser, max_chars)
+
+    return {
+        "title": title,
+        "content": _clean_text(content, max_chars)
+    }
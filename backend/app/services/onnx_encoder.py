@@ -0,0 +1,192 @@
+"""
+ONNX Sentence Encoder
+
+CPU inference backend for EmbeddingService built on ONNX Runtime and the
+Hugging Face `tokenizers` library, so workers don't need to import torch.
+It reproduces the sentence-transformers pipeline of all-MiniLM-L6-v2
+(transformer -> mean pooling -> L2 normalization).
+
+The model directory is produced once, on a machine with torch installed:
+    python -m app.services.onnx_encoder --model all-MiniLM-L6-v2 --output models/all-MiniLM-L6-v2-onnx
+
+which writes:
+    model.onnx        FP32 export
+    model_int8.onnx   Dynamically quantized (int8 weights) copy
+    tokenizer.json    Fast tokenizer definition
+"""
+
+import argparse
+import os
+from typing import List, Optional
+
+import numpy as np
+
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class OnnxSentenceEncoder:
+    """Mean-pooled sentence encoder running on ONNX Runtime."""
+
+    def __init__(self, model_dir: str, quantized: bool = True, max_seq_length: int = 256, num_threads: int = 0):
+        """
+        Load the tokenizer and ONNX Runtime session.
+
+        Args:
+            model_dir: Directory created by export_onnx_model
+            quantized: Use the int8 model instead of FP32
+            max_seq_length: Maximum number of tokens per text
+            num_threads: Intra-op threads (0 lets ONNX Runtime decide)
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = INT8_MODEL_FILE if quantized else FP32_MODEL_FILE
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"ONNX model not found at {model_path}. "
+                f"Export it with: python -m app.services.onnx_encoder --output {model_dir}"
+            )
+
+        self.max_seq_length = max_seq_length
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.no_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self._dimension: Optional[int] = None
+
+    def _run_batch(self, texts: List[str]) -> np.ndarray:
+        """Tokenize, pad to the longest text in the batch and mean-pool token embeddings."""
+        encodings = self.tokenizer.encode_batch(texts)
+        max_len = max(len(e.ids) for e in encodings)
+
+        input_ids = np.zeros((len(texts), max_len), dtype=np.int64)
+        attention_mask = np.zeros((len(texts), max_len), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, inputs)[0]
+        mask = attention_mask[:, :, None].astype(np.float32)
+        return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = True
+    ) -> np.ndarray:
+        """
+        Encode texts. Mirrors SentenceTransformer.encode for the arguments EmbeddingService uses.
+
+        Args:
+            texts: Texts to encode
+            batch_size: Texts per inference call
+            show_progress_bar: Ignored (kept for interface compatibility)
+            convert_to_numpy: Ignored, results are always numpy arrays
+            normalize_embeddings: L2-normalize the output vectors
+
+        Returns:
+            Array of shape (len(texts), dim)
+        """
+        if not texts:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        embeddings = np.concatenate([
+            self._run_batch(texts[start:start + batch_size])
+            for start in range(0, len(texts), batch_size)
+        ]).astype(np.float32)
+
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """
+        Get the dimension of embeddings produced by the model.
+
+        Returns:
+            Embedding dimension
+        """
+        if self._dimension is None:
+            self._dimension = int(self._run_batch(["dimension probe"]).shape[1])
+        return self._dimension
+
+
+def export_onnx_model(model_name: str, output_dir: str, quantize: bool = True):
+    """
+    Export a sentence-transformers model to ONNX and optionally quantize it to int8.
+    Requires torch and sentence-transformers; only needed once per model.
+
+    Args:
+        model_name: sentence-transformers model name or path
+        output_dir: Directory to write model.onnx, model_int8.onnx and tokenizer.json
+        quantize: Also write the dynamically quantized int8 model
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    sample = tokenizer(["export sample text", "another"], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Wrap the transformer so the graph outputs last_hidden_state only."""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *args):
+            return self.model(**dict(zip(input_names, args))).last_hidden_state
+
+    fp32_path = os.path.join(output_dir, FP32_MODEL_FILE)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(transformer),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False
+        )
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+    print(f"Exported {model_name} to {fp32_path}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(output_dir, INT8_MODEL_FILE)
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        print(f"Quantized model written to {int8_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a sentence-transformers model to ONNX")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="sentence-transformers model name or path")
+    parser.add_argument("--output", required=True, help="Output directory")
+    parser.add_argument("--no-quantize", action="store_true", help="Skip the int8 quantized copy")
+    args = parser.parse_args()
+    export_onnx_model(args.model, args.output, quantize=not args.no_quantize)
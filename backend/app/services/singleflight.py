@@ -0,0 +1,42 @@
+"""
+Single Flight
+
+Coalesces concurrent calls that share a key into one in-flight task, so
+identical requests arriving together only do the work once.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls by key."""
+
+    def __init__(self):
+        """Initialize the in-flight task registry."""
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn for key, or join the call already in flight for the same key.
+
+        Args:
+            key: Deduplication key
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            Result of the shared call
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # Shield so one caller disconnecting doesn't cancel the work for everyone
+        return await asyncio.shield(task)
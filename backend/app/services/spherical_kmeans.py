@@ -0,0 +1,100 @@
+"""
+Spherical K-Means
+
+K-means on the unit sphere: points and centroids are L2-normalized and
+assigned by cosine similarity, which suits normalized sentence embeddings.
+Each iteration is one matrix product plus a segment sum, so clustering a
+few thousand 384-d vectors takes milliseconds.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    """L2-normalize rows."""
+    return x / np.clip(np.linalg.norm(x, axis=1, keepdims=True), 1e-12, None)
+
+
+def _init_centroids(x: np.ndarray, n_clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ seeding with cosine distance."""
+    centroids = np.empty((n_clusters, x.shape[1]), dtype=x.dtype)
+    centroids[0] = x[rng.integers(len(x))]
+    closest = 1.0 - x @ centroids[0]
+    for i in range(1, n_clusters):
+        weights = np.clip(closest, 0, None) ** 2
+        total = weights.sum()
+        index = rng.choice(len(x), p=weights / total) if total > 0 else rng.integers(len(x))
+        centroids[i] = x[index]
+        closest = np.minimum(closest, 1.0 - x @ centroids[i])
+    return centroids
+
+
+def _run(x: np.ndarray, centroids: np.ndarray, max_iter: int, tol: float) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Lloyd iterations from the given centroids."""
+    n_clusters = len(centroids)
+    labels = np.zeros(len(x), dtype=np.int64)
+    for _ in range(max_iter):
+        similarities = x @ centroids.T
+        labels = similarities.argmax(axis=1)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, x)
+        counts = np.bincount(labels, minlength=n_clusters)
+
+        # Re-seed empty clusters with the points worst served by their centroid
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            worst = np.argsort(similarities[np.arange(len(x)), labels])[:len(empty)]
+            sums[empty] = x[worst]
+
+        new_centroids = _normalize(sums)
+        shift = float(np.max(1.0 - np.sum(new_centroids * centroids, axis=1)))
+        centroids = new_centroids
+        if shift <= tol:
+            break
+
+    labels = (x @ centroids.T).argmax(axis=1)
+    # Objective is the total cosine distance to the assigned centroid
+    inertia = float(np.sum(1.0 - np.sum(x * centroids[labels], axis=1)))
+    return labels, centroids, inertia
+
+
+def spherical_kmeans(
+    x: np.ndarray,
+    n_clusters: int,
+    n_init: int = 4,
+    max_iter: int = 100,
+    tol: float = 1e-6,
+    random_state: int = 42,
+    init: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Cluster vectors by cosine similarity.
+
+    Args:
+        x: Vectors (n_samples, n_features); normalized internally
+        n_clusters: Number of clusters (capped at n_samples)
+        n_init: Number of k-means++ restarts; the lowest-inertia run wins
+        max_iter: Maximum Lloyd iterations per run
+        tol: Stop when no centroid moves by more than this cosine distance
+        random_state: Seed for reproducible results
+        init: Starting centroids (n_clusters, n_features) for a single warm-started run
+
+    Returns:
+        Tuple of (labels, unit-norm centroids, inertia)
+    """
+    x = _normalize(np.asarray(x, dtype=np.float32))
+    if init is not None:
+        return _run(x, _normalize(np.asarray(init, dtype=np.float32)), max_iter, tol)
+
+    n_clusters = max(1, min(n_clusters, len(x)))
+    rng = np.random.default_rng(random_state)
+
+    best = None
+    for _ in range(max(1, n_init)):
+        result = _run(x, _init_centroids(x, n_clusters, rng), max_iter, tol)
+        if best is None or result[2] < best[2]:
+            best = result
+    return best
@@ -0,0 +1,77 @@
+"""
+Startup Service
+
+Runs the slow parts of start-up (ML library imports, model loading and
+warmup) in the background once the server is accepting connections,
+records how long each phase took, and tracks readiness separately from
+liveness.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class StartupService:
+    """Runs and times start-up phases and reports readiness."""
+
+    def __init__(self):
+        """Initialize start-up state."""
+        self.state = "pending"  # pending, starting, ready or failed
+        self.error: Optional[str] = None
+        self.phases: Dict[str, float] = {}  # phase name -> elapsed milliseconds
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether all start-up phases have finished successfully."""
+        return self.state == "ready"
+
+    def record(self, phase: str, elapsed_seconds: float):
+        """
+        Record the duration of a phase that ran outside run().
+
+        Args:
+            phase: Phase name
+            elapsed_seconds: Duration in seconds
+        """
+        self.phases[phase] = round(elapsed_seconds * 1000, 1)
+        print(f"Startup phase '{phase}' took {self.phases[phase]:.0f} ms")
+
+    async def run(self, phases: List[Tuple[str, Callable[[], Any]]]):
+        """
+        Run blocking start-up phases in order on a worker thread.
+
+        Args:
+            phases: (name, function) pairs; the service becomes ready after the last one
+        """
+        self.state = "starting"
+        for name, fn in phases:
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(fn)
+            except Exception as e:
+                self.state = "failed"
+                self.error = f"{name}: {e}"
+                print(f"Startup phase '{name}' failed: {e}")
+                return
+            self.record(name, time.perf_counter() - start)
+        self.state = "ready"
+        print("API is ready!")
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get start-up status.
+
+        Returns:
+            Dictionary with state, ready flag, per-phase timings and error
+        """
+        return {
+            "status": self.state,
+            "ready": self.is_ready,
+            "phases": dict(self.phases),
+            "error": self.error
+        }
+
+
+# Global startup service instance
+startup_service = StartupService()
@@ -0,0 +1,112 @@
+"""
+Cluster Post-processing Benchmark
+
+Compares building cluster_info and ClusterData with the original per-label
+Python loops against the NumPy implementation in
+ClusteringService.story_columns / build_cluster_data.
+
+Usage (from the backend directory, with .env present):
+    python -m benchmarks.bench_cluster_postprocessing
+    python -m benchmarks.bench_cluster_postprocessing --sizes 10000 100000 --clusters 15
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import List
+
+import numpy as np
+
+from app.models import ClusterData, Story
+from app.services.clustering_service import clustering_service
+
+
+def make_stories(count: int) -> List[Story]:
+    """Build synthetic stories."""
+    now = datetime.now()
+    return [
+        Story(
+            id=str(i), title=f"Story {i}", text=f"Story {i}", url=f"https://example.com/{i}",
+            score=i % 500, author="bench", created_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_cluster_data(embedding_2d: np.ndarray, labels: np.ndarray, stories: List[Story]) -> ClusterData:
+    """The loop-based construction analyze_and_cluster used before vectorization."""
+    unique_labels = set(labels)
+    color_map = clustering_service.generate_colors(len(unique_labels))
+
+    cluster_info = {}
+    for label in unique_labels:
+        cluster_stories_list = [stories[i] for i, l in enumerate(labels) if l == label]
+        scores = []
+        for s in cluster_stories_list:
+            if hasattr(s, 'score'):
+                scores.append(s.score)
+            elif hasattr(s, 'likes'):
+                scores.append(s.likes)
+        cluster_info[int(label)] = {
+            'size': len(cluster_stories_list),
+            'avg_likes': sum(scores) / len(scores) if scores else 0,
+            'label': f"Cluster {label}"
+        }
+
+    story_texts = []
+    for story in stories:
+        if hasattr(story, 'title') and story.title:
+            story_texts.append(story.title)
+        else:
+            story_texts.append(story.text)
+
+    return ClusterData(
+        x=embedding_2d[:, 0].tolist(),
+        y=embedding_2d[:, 1].tolist(),
+        cluster_labels=[int(l) for l in labels],
+        story_texts=story_texts,
+        story_ids=[story.id for story in stories],
+        story_urls=[story.url or story.hn_url for story in stories],
+        colors=[color_map[int(l)] for l in labels],
+        cluster_info=cluster_info
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    """Return the best wall time of fn in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Numbers of stories")
+    parser.add_argument("--clusters", type=int, default=10, help="Number of clusters")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'stories':>9}{'legacy ms':>12}{'columns ms':>12}{'build ms':>10}{'speedup':>10}")
+    for count in args.sizes:
+        stories = make_stories(count)
+        embedding_2d = rng.standard_normal((count, 2)).astype(np.float32)
+        labels = rng.integers(0, args.clusters, count)
+
+        legacy = legacy_cluster_data(embedding_2d, labels, stories)
+        columns = clustering_service.story_columns(stories)
+        vectorized = clustering_service.build_cluster_data(embedding_2d, labels, columns)
+        assert legacy.model_dump() == vectorized.model_dump(), "Vectorized output differs from legacy output"
+
+        legacy_ms = timed(lambda: legacy_cluster_data(embedding_2d, labels, stories), args.repeat)
+        columns_ms = timed(lambda: clustering_service.story_columns(stories), args.repeat)
+        build_ms = timed(lambda: clustering_service.build_cluster_data(embedding_2d, labels, columns), args.repeat)
+        speedup = legacy_ms / (columns_ms + build_ms)
+        print(f"{count:>9}{legacy_ms:>12.1f}{columns_ms:>12.1f}{build_ms:>10.1f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
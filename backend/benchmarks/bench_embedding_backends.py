@@ -0,0 +1,108 @@
+"""
+Embedding Backend Benchmark
+
+Compares sentences per second of the torch (sentence-transformers) backend
+with the ONNX Runtime FP32 and int8 models, and reports cosine similarity of
+each ONNX variant against the torch embeddings on the same texts.
+
+The ONNX directory must first be created with:
+    python -m app.services.onnx_encoder --output models/all-MiniLM-L6-v2-onnx
+
+The corpus defaults to real HN titles exported with:
+    python -m benchmarks.export_hn_titles
+and falls back to the hand-written data/hn_titles_synthetic.txt.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_embedding_backends
+    python -m benchmarks.bench_embedding_backends --repeat 20 --batch-size 64
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.services.onnx_encoder import FP32_MODEL_FILE, INT8_MODEL_FILE, OnnxSentenceEncoder
+
+# A real corpus from export_hn_titles is preferred; the bundled fallback is synthetic
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "hn_titles.txt")
+SYNTHETIC_CORPUS = os.path.join(os.path.dirname(__file__), "data", "hn_titles_synthetic.txt")
+# Same location as the EMBEDDING_ONNX_DIR default, resolved against the backend directory
+DEFAULT_ONNX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "models", "all-MiniLM-L6-v2-onnx")
+
+
+def load_corpus(path: str) -> List[str]:
+    """Load one text per non-empty line."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def bench(encode: Callable[[List[str]], np.ndarray], texts: List[str], repeat: int) -> Dict:
+    """Return sentences per second and the embeddings of one pass."""
+    embeddings = encode(texts)  # warm-up, also used for parity
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode(texts)
+    elapsed = time.perf_counter() - start
+    return {"rate": len(texts) * repeat / elapsed, "embeddings": embeddings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="sentence-transformers model name or path")
+    parser.add_argument("--onnx-dir", default=DEFAULT_ONNX_DIR, help="Directory from onnx_encoder export")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Text file with one sentence per line")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per inference call")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed passes over the corpus")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime intra-op threads (0 = default)")
+    args = parser.parse_args()
+
+    if args.corpus == DEFAULT_CORPUS and not os.path.exists(DEFAULT_CORPUS):
+        print(f"{DEFAULT_CORPUS} not found, using the synthetic corpus (see export_hn_titles)")
+        args.corpus = SYNTHETIC_CORPUS
+    texts = load_corpus(args.corpus)
+    print(f"{len(texts)} texts from {args.corpus}, batch size {args.batch_size}, {args.repeat} passes")
+
+    results = {}
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        torch.set_num_threads(args.threads or torch.get_num_threads())
+        st_model = SentenceTransformer(args.model, device="cpu")
+        results["torch"] = bench(
+            lambda batch: st_model.encode(
+                batch, batch_size=args.batch_size, show_progress_bar=False,
+                convert_to_numpy=True, normalize_embeddings=True
+            ),
+            texts, args.repeat
+        )
+    except ImportError:
+        print("torch / sentence-transformers not installed, skipping torch backend")
+
+    for label, quantized, model_file in (("onnx-fp32", False, FP32_MODEL_FILE), ("onnx-int8", True, INT8_MODEL_FILE)):
+        if not os.path.exists(os.path.join(args.onnx_dir, model_file)):
+            print(f"{model_file} not found in {args.onnx_dir}, skipping {label}")
+            continue
+        encoder = OnnxSentenceEncoder(args.onnx_dir, quantized=quantized, num_threads=args.threads)
+        results[label] = bench(lambda batch: encoder.encode(batch, batch_size=args.batch_size), texts, args.repeat)
+
+    reference = results.get("torch", {}).get("embeddings")
+    print(f"{'backend':<12}{'sentences/s':>14}{'speedup':>10}{'mean cos':>12}{'min cos':>12}")
+    base_rate = results["torch"]["rate"] if "torch" in results else None
+    for label, result in results.items():
+        speedup = f"{result['rate'] / base_rate:.2f}x" if base_rate else "-"
+        if reference is not None:
+            # Embeddings are L2-normalized, so the row-wise dot product is the cosine similarity
+            cosine = np.sum(result["embeddings"] * reference, axis=1)
+            parity = f"{cosine.mean():>12.5f}{cosine.min():>12.5f}"
+        else:
+            parity = f"{'-':>12}{'-':>12}"
+        print(f"{label:<12}{result['rate']:>14.1f}{speedup:>10}{parity}")
+
+
+if __name__ == "__main__":
+    main()
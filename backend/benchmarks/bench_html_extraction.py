@@ -0,0 +1,91 @@
+"""
+HTML Extraction Benchmark
+
+Compares pages per second for each installed parser backend of
+app.services.html_extractor, single-process and through a process pool.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_html_extraction
+    python -m benchmarks.bench_html_extraction --pages-dir saved_pages/ --workers 4
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from app.services.html_extractor import available_parsers, extract_content
+
+
+def synthetic_pages(count: int) -> List[str]:
+    """Build article-like pages with navigation, scripts and long bodies."""
+    pages = []
+    for i in range(count):
+        paragraphs = "\n".join(
+            f"<p>Paragraph {j} of article {i}: " + "lorem ipsum dolor sit amet " * 20 + "</p>"
+            for j in range(40)
+        )
+        pages.append(f"""<!DOCTYPE html>
+<html><head><title>Article {i}</title>
+<script>{'var x = 1;' * 500}</script><style>{'p {{ margin: 0 }}' * 200}</style></head>
+<body>
+<header><nav>{'<a href="/">Home</a>' * 50}</nav></header>
+<main><article><h1>Article {i}</h1>{paragraphs}</article></main>
+<aside>{'<div>Related</div>' * 30}</aside>
+<footer>Footer</footer>
+</body></html>""")
+    return pages
+
+
+def load_pages(pages_dir: str) -> List[str]:
+    """Load saved *.html pages from a directory."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench_serial(pages: List[str], parser: str) -> float:
+    """Return pages per second extracting in the current process."""
+    start = time.perf_counter()
+    for html in pages:
+        extract_content(html, parser)
+    return len(pages) / (time.perf_counter() - start)
+
+
+def bench_pool(pages: List[str], parser: str, workers: int) -> float:
+    """Return pages per second extracting through a process pool."""
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    # Same start method as HackerNewsService's extraction pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method)) as pool:
+        # Warm up the workers so process start-up isn't measured
+        list(pool.map(extract_content, pages[:workers], [parser] * workers))
+        start = time.perf_counter()
+        list(pool.map(extract_content, pages, [parser] * len(pages), chunksize=4))
+        return len(pages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages-dir", help="Directory of saved *.html pages (synthetic pages if omitted)")
+    parser.add_argument("--count", type=int, default=200, help="Number of synthetic pages")
+    parser.add_argument("--workers", type=int, default=2, help="Process pool size (0 to skip)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir) if args.pages_dir else synthetic_pages(args.count)
+    total_kb = sum(len(p) for p in pages) / 1024
+    print(f"{len(pages)} pages, {total_kb:.0f} KB total")
+    print(f"{'parser':<14}{'serial pages/s':>16}{'pool pages/s':>16}")
+
+    for name in available_parsers():
+        serial = bench_serial(pages, name)
+        pooled = bench_pool(pages, name, args.workers) if args.workers > 0 else float("nan")
+        print(f"{name:<14}{serial:>16.1f}{pooled:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
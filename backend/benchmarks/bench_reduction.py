@@ -0,0 +1,50 @@
+"""
+Dimensionality Reduction Benchmark
+
+Compares latency and trustworthiness of the reduction pipelines of
+app.services.clustering_service (umap, pca_umap, pca) on synthetic
+topic-clustered unit vectors shaped like all-MiniLM-L6-v2 embeddings.
+
+Usage (from the backend directory, with .env present):
+    python -m benchmarks.bench_reduction
+    python -m benchmarks.bench_reduction --sizes 100 1000 5000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.clustering_service import REDUCTION_METHODS, clustering_service
+
+
+def synthetic_embeddings(n_samples: int, dim: int = 384, n_topics: int = 8, noise: float = 0.6) -> np.ndarray:
+    """Build normalized vectors scattered around n_topics random topic directions."""
+    rng = np.random.default_rng(0)
+    topics = rng.standard_normal((n_topics, dim))
+    points = topics[rng.integers(0, n_topics, n_samples)] + noise * rng.standard_normal((n_samples, dim)) * np.sqrt(2)
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000], help="Numbers of points")
+    args = parser.parse_args()
+
+    # Compile numba kernels once so the first measured UMAP run isn't penalized
+    clustering_service.warmup()
+
+    print(f"{'points':>8}  {'method':<10}{'latency ms':>12}{'trustworthiness':>17}")
+    for n_samples in args.sizes:
+        embeddings = synthetic_embeddings(n_samples)
+        for method in REDUCTION_METHODS:
+            start = time.perf_counter()
+            embedding_2d = clustering_service.reduce_dimensions(embeddings, method)
+            latency_ms = (time.perf_counter() - start) * 1000
+            score = clustering_service.trustworthiness_score(embeddings, embedding_2d)
+            print(f"{n_samples:>8}  {method:<10}{latency_ms:>12.1f}{score:>17.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+HN Title Corpus Export
+
+Dumps real story titles returned by HackerNewsService.search_stories to a
+text file (one title per line) for bench_embedding_backends. The bundled
+data/hn_titles_synthetic.txt is hand-written in the style of HN titles;
+export a real corpus where the Algolia API is reachable.
+
+Usage (from the backend directory, with .env present):
+    python -m benchmarks.export_hn_titles
+    python -m benchmarks.export_hn_titles --queries rust postgres llm --limit 200 --days 30
+"""
+
+import argparse
+import asyncio
+import os
+
+from app.services.hackernews_service import hackernews_service
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "data", "hn_titles.txt")
+DEFAULT_QUERIES = ["rust", "python", "postgres", "llm", "linux", "startup", "security", "javascript"]
+
+
+async def export(queries, limit: int, days: int):
+    """Collect unique titles of the stories found for each query."""
+    await hackernews_service.start()
+    try:
+        titles = {}
+        for query in queries:
+            stories, _, _ = await hackernews_service.search_stories(query, "top", limit=limit, days=days)
+            for story in stories:
+                title = " ".join(story.title.split())
+                if title:
+                    titles.setdefault(title, None)
+            print(f"{query}: {len(stories)} stories, {len(titles)} unique titles so far")
+        return list(titles)
+    finally:
+        await hackernews_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES, help="Search queries to collect titles from")
+    parser.add_argument("--limit", type=int, default=100, help="Stories per query")
+    parser.add_argument("--days", type=int, default=30, help="Days to look back")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Output text file")
+    args = parser.parse_args()
+
+    titles = asyncio.run(export(args.queries, args.limit, args.days))
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.writelines(f"{title}\n" for title in titles)
+    print(f"Wrote {len(titles)} titles to {args.output}")
+
+
+if __name__ == "__main__":
+    main()